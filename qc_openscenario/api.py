@@ -0,0 +1,103 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import copy
+import os
+
+from typing import Iterable, Optional, Union
+
+from lxml import etree
+from qc_baselib import Configuration, Result
+
+from qc_openscenario import constants
+from qc_openscenario import main
+from qc_openscenario.checks import models, registry, utils
+
+# Identifies the document in the results when it is not read from a file
+IN_MEMORY_INPUT_FILE = "<memory>"
+
+
+def _ingest_tree(
+    xml_tree: etree._ElementTree,
+) -> etree._ElementTree:
+    # The tree of the caller is left untouched, it is only copied when its
+    # default namespace has to be removed
+    if etree.QName(xml_tree.getroot()).namespace is None:
+        return xml_tree
+
+    return utils.strip_default_namespace(copy.deepcopy(xml_tree))
+
+
+def _get_road_network_facts(
+    xodr: Union[str, os.PathLike, bytes, models.RoadNetworkFacts, None],
+) -> Optional[models.RoadNetworkFacts]:
+    if xodr is None or isinstance(xodr, models.RoadNetworkFacts):
+        return xodr
+
+    if isinstance(xodr, bytes):
+        return utils.extract_road_network_facts_from_content(xodr)
+
+    return utils.get_cached_road_network_facts(os.fspath(xodr))
+
+
+def validate(
+    source: Union[bytes, etree._ElementTree],
+    *,
+    xodr: Union[str, os.PathLike, bytes, models.RoadNetworkFacts, None] = None,
+    checks: Optional[Iterable[str]] = None,
+    config: Optional[Configuration] = None,
+) -> Result:
+    """Check an OpenSCENARIO document held in memory.
+    Nothing is read from or written to disk, except the xodr file if given as a path.
+
+    Args:
+        source (Union[bytes, etree._ElementTree]): raw content of the document,
+            or its already parsed tree. The tree is not modified
+        xodr (Union[str, os.PathLike, bytes, models.RoadNetworkFacts, None]):
+            the road network of the document, as a path, raw content or
+            extracted facts. If not specified, the xodr file referenced by the
+            document is read, relative to the current directory
+        checks (Optional[Iterable[str]]): ids of the checkers to run. The
+            checkers they depend on are also run. All the checkers if not specified
+        config (Optional[Configuration]): configuration with checker bundle
+            parameters. The input file of the configuration is ignored
+
+    Raises:
+        ValueError: if a checker id is unknown
+        etree.XMLSyntaxError: if the xodr content is not a well-formed xml document
+
+    Returns:
+        Result: the result of the checks
+    """
+    checker_ids = (
+        registry.CHECKER_REGISTRY.select(checks) if checks is not None else None
+    )
+
+    if config is None:
+        config = Configuration()
+        config.register_checker_bundle(checker_bundle_name=constants.BUNDLE_NAME)
+
+    result = main.create_result()
+
+    checker_data = models.CheckerData(
+        xml_file_path=IN_MEMORY_INPUT_FILE,
+        input_file_xml_root=None,
+        config=config,
+        result=result,
+        schema_version=None,
+        road_network_facts=_get_road_network_facts(xodr),
+    )
+
+    if isinstance(source, bytes):
+        checker_data.input_file_xml_root, checker_data.xml_syntax_error = (
+            utils.ingest_xml_content(source)
+        )
+    else:
+        checker_data.input_file_xml_root = _ingest_tree(source)
+
+    main.check_document(checker_data, checker_ids)
+
+    return result
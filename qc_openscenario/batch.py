@@ -0,0 +1,254 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import json
+import logging
+import os
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set
+
+from qc_openscenario.checks import utils
+
+INPUT_FILE_EXTENSION = ".xosc"
+RESULT_FILE_EXTENSION = ".xqar"
+
+
+def get_input_files(batch_path: str) -> List[str]:
+    """Get the files to check in a batch
+
+    Args:
+        batch_path (str): either a directory, searched recursively for .xosc files,
+            or a text file listing one input file per line. In a list, empty lines
+            and lines starting with # are ignored, and relative paths are relative
+            to the directory of the list
+
+    Returns:
+        List[str]: the input file paths
+    """
+    if os.path.isdir(batch_path):
+        input_files = []
+        for dir_path, _, file_names in os.walk(batch_path):
+            for file_name in file_names:
+                if file_name.endswith(INPUT_FILE_EXTENSION):
+                    input_files.append(os.path.join(dir_path, file_name))
+
+        return sorted(input_files)
+
+    list_dir = os.path.dirname(batch_path)
+    input_files = []
+    with open(batch_path, "r") as list_file:
+        for line in list_file:
+            line = line.strip()
+            if line == "" or line.startswith("#"):
+                continue
+            input_files.append(os.path.join(list_dir, line))
+
+    return input_files
+
+
+def get_result_files(input_files: List[str], output_dir: str) -> List[str]:
+    """Get one result file path in output_dir for each input file.
+    Results are named after their input file, with a numeric suffix if
+    several input files have the same name.
+
+    Args:
+        input_files (List[str]): the input file paths
+        output_dir (str): directory of the result files
+
+    Returns:
+        List[str]: the result file paths, in the same order as the input files
+    """
+    result_files = []
+    used_names = set()
+
+    for input_file in input_files:
+        stem = os.path.splitext(os.path.basename(input_file))[0]
+        name = stem
+        suffix = 1
+        while name in used_names:
+            name = f"{stem}_{suffix}"
+            suffix += 1
+        used_names.add(name)
+
+        result_files.append(os.path.join(output_dir, name + RESULT_FILE_EXTENSION))
+
+    return result_files
+
+
+def load_file_costs(cost_file: Optional[str]) -> Dict[str, dict]:
+    """Load the check durations measured in a prior batch run
+
+    Args:
+        cost_file (Optional[str]): JSON file written by save_file_costs
+
+    Returns:
+        Dict[str, dict]: the size in bytes and check duration in seconds of
+            each file, keyed by absolute path. Empty if the file does not exist
+    """
+    if cost_file is None or not os.path.isfile(cost_file):
+        return {}
+
+    try:
+        with open(cost_file, "r") as file:
+            return json.load(file)
+    except (OSError, ValueError) as e:
+        logging.warning(f"Cannot read file costs from {cost_file}: {e}")
+        return {}
+
+
+def save_file_costs(cost_file: str, file_costs: Dict[str, dict]) -> None:
+    """Save the check durations of a batch run for the scheduling of later runs
+
+    Args:
+        cost_file (str): JSON file to write
+        file_costs (Dict[str, dict]): the size in bytes and check duration in
+            seconds of each file, keyed by absolute path
+    """
+    try:
+        with open(cost_file, "w") as file:
+            json.dump(file_costs, file, indent=2, sort_keys=True)
+    except OSError as e:
+        logging.warning(f"Cannot write file costs to {cost_file}: {e}")
+
+
+def get_file_size(input_file: str) -> int:
+    try:
+        return os.path.getsize(input_file)
+    except OSError:
+        return 0
+
+
+def estimate_file_costs(
+    input_files: List[str], file_costs: Dict[str, dict]
+) -> List[float]:
+    """Estimate the cost of checking each file of a batch.
+    Files checked in a prior run with the same size cost their measured
+    duration. Other files are estimated from their size, at the average
+    throughput of the measured files, or simply cost their size in bytes if
+    no file was measured.
+
+    Args:
+        input_files (List[str]): the input file paths
+        file_costs (Dict[str, dict]): the costs measured in a prior run
+
+    Returns:
+        List[float]: the estimated cost of each file, in the same order as the input files
+    """
+    sizes = [get_file_size(input_file) for input_file in input_files]
+
+    measured_costs = []
+    for input_file, size in zip(input_files, sizes):
+        file_cost = file_costs.get(os.path.abspath(input_file))
+        if file_cost is not None and file_cost.get("size") == size:
+            measured_costs.append(float(file_cost["seconds"]))
+        else:
+            measured_costs.append(None)
+
+    measured_bytes = sum(
+        size for size, cost in zip(sizes, measured_costs) if cost is not None
+    )
+    measured_seconds = sum(cost for cost in measured_costs if cost is not None)
+    seconds_per_byte = measured_seconds / measured_bytes if measured_bytes else 1.0
+
+    return [
+        cost if cost is not None else size * seconds_per_byte
+        for size, cost in zip(sizes, measured_costs)
+    ]
+
+
+def order_largest_first(input_files: List[str], costs: List[float]) -> List[int]:
+    """Order the files of a batch by decreasing cost.
+    Handing out the most expensive files first keeps a large file from
+    running alone at the end of the batch while the other workers are idle.
+
+    Args:
+        input_files (List[str]): the input file paths
+        costs (List[float]): the estimated cost of each file
+
+    Returns:
+        List[int]: the indices of the input files, most expensive first. Files
+            of equal cost keep their input order
+    """
+    return sorted(range(len(input_files)), key=lambda i: -costs[i])
+
+
+@dataclass
+class WorkerPool:
+    """A group of worker processes checking the files of some schema versions"""
+
+    workers: int
+    schema_versions: Set[Optional[str]] = field(default_factory=set)
+    file_indices: List[int] = field(default_factory=list)
+
+
+def get_schema_versions(input_files: List[str]) -> List[Optional[str]]:
+    """Get the schema version of each file of a batch from its FileHeader.
+    Only the beginning of each file is read.
+
+    Args:
+        input_files (List[str]): the input file paths
+
+    Returns:
+        List[Optional[str]]: the schema version of each file, in the same order
+            as the input files. None if it cannot be read
+    """
+    return [utils.read_header_schema_version(input_file) for input_file in input_files]
+
+
+def plan_worker_pools(
+    schema_versions: List[Optional[str]], costs: List[float], workers: int
+) -> List[WorkerPool]:
+    """Split the workers of a batch into pools checking disjoint sets of schema
+    versions, so that each worker compiles as few schemas as possible.
+    If there are at least as many workers as versions, each version gets its
+    own pool, with a number of workers proportional to the cost of its files.
+    Otherwise each pool has a single worker and the versions are assigned to
+    the pools largest first, balancing their cost.
+
+    Args:
+        schema_versions (List[Optional[str]]): the schema version of each file
+        costs (List[float]): the estimated cost of each file
+        workers (int): the total number of workers
+
+    Returns:
+        List[WorkerPool]: the pools. The file indices of each pool keep their
+            order in schema_versions
+    """
+    bucket_costs: Dict[Optional[str], float] = {}
+    bucket_sizes: Dict[Optional[str], int] = {}
+    for schema_version, cost in zip(schema_versions, costs):
+        bucket_costs[schema_version] = bucket_costs.get(schema_version, 0.0) + cost
+        bucket_sizes[schema_version] = bucket_sizes.get(schema_version, 0) + 1
+
+    buckets = sorted(bucket_costs, key=lambda x: (-bucket_costs[x], str(x)))
+
+    if workers >= len(buckets):
+        pools = {x: WorkerPool(workers=1, schema_versions={x}) for x in buckets}
+        for _ in range(workers - len(buckets)):
+            # Give the next worker to the version with the highest cost per
+            # worker, never more workers than files
+            candidates = [x for x in buckets if pools[x].workers < bucket_sizes[x]]
+            if not candidates:
+                break
+            bucket = max(candidates, key=lambda x: bucket_costs[x] / pools[x].workers)
+            pools[bucket].workers += 1
+        pool_of_version = pools
+    else:
+        worker_pools = [WorkerPool(workers=1) for _ in range(workers)]
+        pool_costs = [0.0] * workers
+        pool_of_version = {}
+        for bucket in buckets:
+            i = pool_costs.index(min(pool_costs))
+            worker_pools[i].schema_versions.add(bucket)
+            pool_costs[i] += bucket_costs[bucket]
+            pool_of_version[bucket] = worker_pools[i]
+
+    for i, schema_version in enumerate(schema_versions):
+        pool_of_version[schema_version].file_indices.append(i)
+
+    # Several versions may share a pool
+    return list({id(pool): pool for pool in pool_of_version.values()}.values())
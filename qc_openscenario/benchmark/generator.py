@@ -0,0 +1,391 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import os
+import random
+
+from dataclasses import dataclass
+from typing import List
+
+from lxml import etree
+
+XODR_FILE_NAME = "road_network.xodr"
+CATALOG_DIR_NAME = "catalogs"
+CATALOG_FILE_NAME = "VehicleCatalog.xosc"
+CATALOG_NAME = "VehicleCatalog"
+SCENARIO_FILE_PREFIX = "scenario_"
+
+
+@dataclass(frozen=True)
+class CorpusSettings:
+    """Shape of the scenarios of a synthetic corpus"""
+
+    files: int
+    entities: int
+    stories: int
+    acts_per_story: int
+    maneuvers_per_act: int
+    events_per_maneuver: int
+    # Share of the stories and maneuvers declaring their own parameters, in [0, 1]
+    parameter_declaration_density: float
+    parameters_per_declaration: int
+    # Share of the numeric values written as expressions rather than
+    # literals or parameter references, in [0, 1]
+    expression_density: float
+    # Number of vehicles in the catalog file, none if 0
+    catalog_size: int
+    # Number of signals in the xodr file referenced by all the scenarios
+    signals: int
+    seed: int = 0
+
+
+class _ScenarioGenerator:
+    def __init__(self, settings: CorpusSettings, seed: int):
+        self._settings = settings
+        self._random = random.Random(seed)
+        # Parameters visible from the element being generated, innermost last
+        self._parameter_scopes: List[List[str]] = []
+
+    def _value(self, minimum: float, maximum: float) -> str:
+        """A numeric value, either literal, a parameter reference or an expression"""
+        literal = f"{self._random.uniform(minimum, maximum):.2f}"
+        parameters = [x for scope in self._parameter_scopes for x in scope]
+
+        draw = self._random.random()
+        if draw < self._settings.expression_density:
+            if not parameters:
+                return f"${{{literal} + 1}}"
+            operator = self._random.choice(["+", "*"])
+            return f"${{${self._random.choice(parameters)} {operator} {literal}}}"
+        if parameters and draw < (1 + self._settings.expression_density) / 2:
+            return f"${self._random.choice(parameters)}"
+        return literal
+
+    def _add_parameter_declarations(
+        self, parent: etree._Element, prefix: str, count: int
+    ) -> None:
+        declarations = etree.SubElement(parent, "ParameterDeclarations")
+        scope = []
+        for i in range(count):
+            name = f"{prefix}_{i}"
+            etree.SubElement(
+                declarations,
+                "ParameterDeclaration",
+                name=name,
+                parameterType="double",
+                value=f"{self._random.uniform(1, 10):.2f}",
+            )
+            scope.append(name)
+        self._parameter_scopes.append(scope)
+
+    def _maybe_add_parameter_declarations(
+        self, parent: etree._Element, prefix: str
+    ) -> bool:
+        if self._random.random() >= self._settings.parameter_declaration_density:
+            return False
+        self._add_parameter_declarations(
+            parent, prefix, self._settings.parameters_per_declaration
+        )
+        return True
+
+    def _add_vehicle(
+        self, parent: etree._Element, name: str, declare_parameters: bool = False
+    ) -> None:
+        vehicle = etree.SubElement(parent, "Vehicle", name=name, vehicleCategory="car")
+        if declare_parameters:
+            # Entries of a catalog usually share their parameter names
+            self._add_parameter_declarations(
+                vehicle, "vehicle", max(1, self._settings.parameters_per_declaration)
+            )
+
+        bounding_box = etree.SubElement(vehicle, "BoundingBox")
+        etree.SubElement(bounding_box, "Center", x="1.3", y="0.0", z="0.75")
+        etree.SubElement(
+            bounding_box,
+            "Dimensions",
+            width="1.8",
+            length=self._value(4, 5),
+            height="1.5",
+        )
+        etree.SubElement(
+            vehicle,
+            "Performance",
+            maxSpeed=self._value(50, 70),
+            maxDeceleration="10.0",
+            maxAcceleration="5.0",
+        )
+        axles = etree.SubElement(vehicle, "Axles")
+        for axle, position_x in [("FrontAxle", "2.98"), ("RearAxle", "0.0")]:
+            etree.SubElement(
+                axles,
+                axle,
+                maxSteering="0.5",
+                wheelDiameter="0.8",
+                trackWidth="1.68",
+                positionX=position_x,
+                positionZ="0.4",
+            )
+
+        if declare_parameters:
+            self._parameter_scopes.pop()
+
+    def _add_speed_action(self, parent: etree._Element) -> None:
+        private_action = etree.SubElement(parent, "PrivateAction")
+        longitudinal_action = etree.SubElement(private_action, "LongitudinalAction")
+        speed_action = etree.SubElement(longitudinal_action, "SpeedAction")
+        etree.SubElement(
+            speed_action,
+            "SpeedActionDynamics",
+            dynamicsShape="linear",
+            value=self._value(1, 5),
+            dynamicsDimension="time",
+        )
+        target = etree.SubElement(speed_action, "SpeedActionTarget")
+        etree.SubElement(target, "AbsoluteTargetSpeed", value=self._value(5, 30))
+
+    def _add_signal_action(self, parent: etree._Element) -> None:
+        global_action = etree.SubElement(parent, "GlobalAction")
+        infrastructure_action = etree.SubElement(global_action, "InfrastructureAction")
+        signal_action = etree.SubElement(infrastructure_action, "TrafficSignalAction")
+        etree.SubElement(
+            signal_action,
+            "TrafficSignalStateAction",
+            name=str(self._random.randrange(self._settings.signals)),
+            state=self._random.choice(["on;off;off", "off;off;on"]),
+        )
+
+    def _add_trigger(self, parent: etree._Element, tag: str, name: str) -> None:
+        trigger = etree.SubElement(parent, tag)
+        condition_group = etree.SubElement(trigger, "ConditionGroup")
+        condition = etree.SubElement(
+            condition_group,
+            "Condition",
+            name=name,
+            delay="0",
+            conditionEdge="rising",
+        )
+        by_value_condition = etree.SubElement(condition, "ByValueCondition")
+        etree.SubElement(
+            by_value_condition,
+            "SimulationTimeCondition",
+            value=self._value(0, 60),
+            rule="greaterThan",
+        )
+
+    def _add_story(self, storyboard: etree._Element, story_index: int) -> str:
+        story_name = f"Story{story_index}"
+        story = etree.SubElement(storyboard, "Story", name=story_name)
+        story_declares = self._maybe_add_parameter_declarations(
+            story, f"story{story_index}"
+        )
+
+        for act_index in range(self._settings.acts_per_story):
+            act = etree.SubElement(story, "Act", name=f"Act{act_index}")
+            maneuver_group = etree.SubElement(
+                act,
+                "ManeuverGroup",
+                maximumExecutionCount="1",
+                name=f"ManeuverGroup{act_index}",
+            )
+            actors = etree.SubElement(
+                maneuver_group, "Actors", selectTriggeringEntities="false"
+            )
+            etree.SubElement(
+                actors,
+                "EntityRef",
+                entityRef=f"Vehicle{self._random.randrange(self._settings.entities)}",
+            )
+
+            for maneuver_index in range(self._settings.maneuvers_per_act):
+                maneuver = etree.SubElement(
+                    maneuver_group, "Maneuver", name=f"Maneuver{maneuver_index}"
+                )
+                maneuver_declares = self._maybe_add_parameter_declarations(
+                    maneuver, f"story{story_index}_act{act_index}_m{maneuver_index}"
+                )
+
+                for event_index in range(self._settings.events_per_maneuver):
+                    event = etree.SubElement(
+                        maneuver,
+                        "Event",
+                        name=f"Event{event_index}",
+                        priority="override",
+                    )
+                    action = etree.SubElement(event, "Action", name="Action0")
+                    if self._settings.signals > 0 and event_index % 2 == 1:
+                        self._add_signal_action(action)
+                    else:
+                        self._add_speed_action(action)
+                    self._add_trigger(event, "StartTrigger", "EventStart")
+
+                if maneuver_declares:
+                    self._parameter_scopes.pop()
+
+            self._add_trigger(act, "StartTrigger", "ActStart")
+
+        if story_declares:
+            self._parameter_scopes.pop()
+
+        return story_name
+
+    def generate_scenario(self) -> etree._ElementTree:
+        settings = self._settings
+        root = etree.Element("OpenSCENARIO")
+        etree.SubElement(
+            root,
+            "FileHeader",
+            author="qc-openscenarioxml benchmark",
+            date="2024-01-01T00:00:00",
+            description="Synthetic scenario",
+            revMajor="1",
+            revMinor="3",
+        )
+        self._add_parameter_declarations(
+            root, "global", max(1, settings.parameters_per_declaration)
+        )
+
+        catalog_locations = etree.SubElement(root, "CatalogLocations")
+        if settings.catalog_size > 0:
+            vehicle_catalog = etree.SubElement(catalog_locations, "VehicleCatalog")
+            etree.SubElement(vehicle_catalog, "Directory", path=CATALOG_DIR_NAME)
+
+        road_network = etree.SubElement(root, "RoadNetwork")
+        if settings.signals > 0:
+            etree.SubElement(road_network, "LogicFile", filepath=XODR_FILE_NAME)
+
+        entities = etree.SubElement(root, "Entities")
+        for i in range(settings.entities):
+            scenario_object = etree.SubElement(
+                entities, "ScenarioObject", name=f"Vehicle{i}"
+            )
+            self._add_vehicle(scenario_object, f"Vehicle{i}")
+
+        storyboard = etree.SubElement(root, "Storyboard")
+        init = etree.SubElement(storyboard, "Init")
+        actions = etree.SubElement(init, "Actions")
+        for i in range(settings.entities):
+            private = etree.SubElement(actions, "Private", entityRef=f"Vehicle{i}")
+            private_action = etree.SubElement(private, "PrivateAction")
+            teleport_action = etree.SubElement(private_action, "TeleportAction")
+            position = etree.SubElement(teleport_action, "Position")
+            etree.SubElement(
+                position, "WorldPosition", x=self._value(0, 1000), y=f"{i * 3.5}"
+            )
+
+        story_names = [self._add_story(storyboard, i) for i in range(settings.stories)]
+
+        stop_trigger = etree.SubElement(storyboard, "StopTrigger")
+        condition_group = etree.SubElement(stop_trigger, "ConditionGroup")
+        for story_name in story_names:
+            condition = etree.SubElement(
+                condition_group,
+                "Condition",
+                name=f"{story_name}End",
+                delay="0",
+                conditionEdge="rising",
+            )
+            by_value_condition = etree.SubElement(condition, "ByValueCondition")
+            etree.SubElement(
+                by_value_condition,
+                "StoryboardElementStateCondition",
+                storyboardElementType="story",
+                storyboardElementRef=story_name,
+                state="completeState",
+            )
+
+        self._parameter_scopes.pop()
+        return etree.ElementTree(root)
+
+    def generate_catalog(self) -> etree._ElementTree:
+        root = etree.Element("OpenSCENARIO")
+        etree.SubElement(
+            root,
+            "FileHeader",
+            author="qc-openscenarioxml benchmark",
+            date="2024-01-01T00:00:00",
+            description="Synthetic vehicle catalog",
+            revMajor="1",
+            revMinor="3",
+        )
+        catalog = etree.SubElement(root, "Catalog", name=CATALOG_NAME)
+        for i in range(self._settings.catalog_size):
+            # Parameters of a catalog entry are declared in the entry itself
+            self._add_vehicle(catalog, f"CatalogVehicle{i}", declare_parameters=True)
+        return etree.ElementTree(root)
+
+
+def generate_road_network(signals: int) -> etree._ElementTree:
+    """Generate an OpenDRIVE road with the given number of signals, whose ids
+    are their index"""
+    root = etree.Element("OpenDRIVE")
+    etree.SubElement(root, "header", revMajor="1", revMinor="6", name="benchmark")
+    length = max(100.0, signals * 10.0)
+    road = etree.SubElement(
+        root, "road", name="A", length=f"{length}", id="1", junction="-1", rule="RHT"
+    )
+    plan_view = etree.SubElement(road, "planView")
+    geometry = etree.SubElement(
+        plan_view, "geometry", s="0.0", x="0.0", y="0.0", hdg="0.0", length=f"{length}"
+    )
+    etree.SubElement(geometry, "line")
+    signals_element = etree.SubElement(road, "signals")
+    for i in range(signals):
+        etree.SubElement(
+            signals_element,
+            "signal",
+            s=f"{i * 10.0}",
+            t="0.0",
+            zOffset="0.0",
+            dynamic="yes",
+            id=str(i),
+            orientation="+",
+            type="1000001",
+            subtype="-1",
+        )
+    return etree.ElementTree(root)
+
+
+def generate_corpus(output_dir: str, settings: CorpusSettings) -> List[str]:
+    """Write a corpus of valid scenarios, along with the road network and
+    catalog they reference. The same settings always give the same files.
+
+    Args:
+        output_dir (str): directory of the corpus, created if needed
+        settings (CorpusSettings): shape of the scenarios
+
+    Returns:
+        List[str]: paths of the scenario files
+    """
+    os.makedirs(output_dir, exist_ok=True)
+
+    if settings.signals > 0:
+        generate_road_network(settings.signals).write(
+            os.path.join(output_dir, XODR_FILE_NAME),
+            xml_declaration=True,
+            encoding="UTF-8",
+            pretty_print=True,
+        )
+
+    if settings.catalog_size > 0:
+        catalog_dir = os.path.join(output_dir, CATALOG_DIR_NAME)
+        os.makedirs(catalog_dir, exist_ok=True)
+        _ScenarioGenerator(settings, settings.seed).generate_catalog().write(
+            os.path.join(catalog_dir, CATALOG_FILE_NAME),
+            xml_declaration=True,
+            encoding="UTF-8",
+            pretty_print=True,
+        )
+
+    scenario_files = []
+    for i in range(settings.files):
+        scenario_file = os.path.join(output_dir, f"{SCENARIO_FILE_PREFIX}{i:04d}.xosc")
+        # Each file has its own seed, so that the files differ from each other
+        _ScenarioGenerator(settings, settings.seed + i + 1).generate_scenario().write(
+            scenario_file, xml_declaration=True, encoding="UTF-8", pretty_print=True
+        )
+        scenario_files.append(scenario_file)
+
+    return scenario_files
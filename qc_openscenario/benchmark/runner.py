@@ -0,0 +1,231 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import argparse
+import dataclasses
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import sys
+import tempfile
+import time
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+from lxml import etree
+from qc_baselib import Configuration
+
+import qc_openscenario.main as qc_main
+
+from qc_openscenario import constants
+from qc_openscenario.benchmark import generator
+from qc_openscenario.checks import registry
+from qc_openscenario.schema import schema_registry
+
+DEFAULT_BASELINE_FILE = "benchmark_baseline.json"
+
+CORPORA: Dict[str, generator.CorpusSettings] = {
+    "small": generator.CorpusSettings(
+        files=50,
+        entities=3,
+        stories=1,
+        acts_per_story=2,
+        maneuvers_per_act=2,
+        events_per_maneuver=2,
+        parameter_declaration_density=0.3,
+        parameters_per_declaration=2,
+        expression_density=0.2,
+        catalog_size=10,
+        signals=20,
+    ),
+    "medium": generator.CorpusSettings(
+        files=10,
+        entities=20,
+        stories=5,
+        acts_per_story=4,
+        maneuvers_per_act=4,
+        events_per_maneuver=3,
+        parameter_declaration_density=0.5,
+        parameters_per_declaration=4,
+        expression_density=0.3,
+        catalog_size=50,
+        signals=200,
+    ),
+    "huge": generator.CorpusSettings(
+        files=2,
+        entities=200,
+        stories=20,
+        acts_per_story=10,
+        maneuvers_per_act=10,
+        events_per_maneuver=5,
+        parameter_declaration_density=0.5,
+        parameters_per_declaration=5,
+        expression_density=0.3,
+        catalog_size=100,
+        signals=1000,
+    ),
+}
+
+
+def _get_peak_rss() -> Optional[int]:
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Reported in bytes on macOS and in KB elsewhere
+    return peak_rss if sys.platform == "darwin" else peak_rss * 1024
+
+
+def _run_corpus(input_files: List[str], repeat: int) -> Dict:
+    # Runs in a fresh process, so that its peak RSS only covers this corpus
+    logging.getLogger().setLevel(logging.WARNING)
+    # Schemas are compiled upfront, as in batch mode and by the server
+    schema_registry.preload_schemas()
+
+    best_seconds = None
+    best_checkers = None
+    for _ in range(repeat):
+        seconds = 0.0
+        checkers = {
+            x.checker_id: [0.0, 0.0] for x in registry.CHECKER_REGISTRY.checkers
+        }
+
+        for input_file in input_files:
+            config = Configuration()
+            config.set_config_param(name="InputFile", value=input_file)
+            config.register_checker_bundle(checker_bundle_name=constants.BUNDLE_NAME)
+            config.set_checker_bundle_param(
+                checker_bundle_name=constants.BUNDLE_NAME,
+                name="checkerMetrics",
+                value="true",
+            )
+            result = qc_main.create_result()
+
+            start_time = time.perf_counter()
+            checker_data = qc_main.run_checks(config, result)
+            seconds += time.perf_counter() - start_time
+
+            for checker_id, metrics in checker_data.checker_metrics.items():
+                checkers[checker_id][0] += metrics.wall_time
+                checkers[checker_id][1] += metrics.cpu_time
+
+        if best_seconds is None or seconds < best_seconds:
+            best_seconds, best_checkers = seconds, checkers
+
+    return {
+        "seconds": best_seconds,
+        "checkers": {
+            x: {"wall_time": y[0], "cpu_time": y[1]} for x, y in best_checkers.items()
+        },
+        "peak_rss": _get_peak_rss(),
+    }
+
+
+def run_benchmark(
+    corpora: List[str],
+    corpus_dir: Optional[str] = None,
+    repeat: int = 1,
+) -> Dict:
+    """Generate the corpora and time run_checks and each checker on them
+
+    Args:
+        corpora (List[str]): names of the corpora to run, see CORPORA
+        corpus_dir (Optional[str]): directory to generate the corpora in,
+            kept afterwards. A temporary directory if not specified
+        repeat (int): number of runs of each corpus, the fastest one is kept
+
+    Returns:
+        Dict: the measures of each corpus, along with the environment
+    """
+    baseline = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "lxml": ".".join(map(str, etree.LXML_VERSION)),
+        "corpora": {},
+    }
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for name in corpora:
+            settings = CORPORA[name]
+            input_files = generator.generate_corpus(
+                os.path.join(corpus_dir or temp_dir, name), settings
+            )
+            size = sum(os.path.getsize(x) for x in input_files)
+
+            logging.info(
+                f"Checking {name} corpus: {len(input_files)} files, {size / 1e6:.1f} MB"
+            )
+            # One process per corpus, spawned to start from a clean memory state
+            with ProcessPoolExecutor(
+                max_workers=1, mp_context=multiprocessing.get_context("spawn")
+            ) as executor:
+                measures = executor.submit(_run_corpus, input_files, repeat).result()
+
+            seconds = measures["seconds"]
+            baseline["corpora"][name] = {
+                "settings": dataclasses.asdict(settings),
+                "files": len(input_files),
+                "bytes": size,
+                "seconds": seconds,
+                "mb_per_s": size / 1e6 / seconds,
+                "files_per_s": len(input_files) / seconds,
+                "peak_rss": measures["peak_rss"],
+                "checkers": measures["checkers"],
+            }
+            logging.info(
+                f"{name}: {seconds:.3f} s, {size / 1e6 / seconds:.2f} MB/s, "
+                f"{len(input_files) / seconds:.1f} files/s"
+            )
+
+    return baseline
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="QC OpenScenario Checker benchmark",
+        description="Time the checks on synthetic corpora of OpenScenario files.",
+    )
+    parser.add_argument(
+        "--corpora",
+        nargs="+",
+        choices=list(CORPORA),
+        default=list(CORPORA),
+        help="Corpora to run.",
+    )
+    parser.add_argument(
+        "--baseline",
+        default=DEFAULT_BASELINE_FILE,
+        help="JSON file to write the measures to.",
+    )
+    parser.add_argument(
+        "--corpus_dir",
+        help="Directory to generate the corpora in, kept after the run.",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=1,
+        help="Number of runs of each corpus, the fastest one is kept.",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(format="%(asctime)s - %(message)s", level=logging.INFO)
+
+    baseline = run_benchmark(args.corpora, args.corpus_dir, args.repeat)
+
+    with open(args.baseline, "w") as file:
+        json.dump(baseline, file, indent=2)
+
+    logging.info(f"Baseline written to {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,3 +9,7 @@ from . import basic_checker as basic_checker
 from . import reference_checker as reference_checker
 from . import models as models
 from . import utils as utils
+from . import road_network_cache as road_network_cache
+from . import registry as registry
+from . import result_recorder as result_recorder
+from . import checker_metrics as checker_metrics
@@ -6,7 +6,7 @@
 
 import logging
 
-from lxml import etree
+from typing import Optional
 
 from qc_baselib import IssueSeverity
 from qc_openscenario import constants
@@ -18,17 +18,20 @@ CHECKER_PRECONDITIONS = set()
 RULE_UID = "asam.net:xosc:1.0.0:xml.valid_xml_document"
 
 
-def _is_xml_doc(file_path: str) -> tuple[bool, tuple[int, int]]:
-    try:
-        with open(file_path, "rb") as file:
-            xml_content = file.read()
-            etree.fromstring(xml_content)
-            logging.info("- It is an xml document.")
-        return True, None
-    except etree.XMLSyntaxError as e:
-        logging.error(f"- Error: {e}")
-        logging.error(f"- Error occurred at line {e.lineno}, column {e.offset}")
-        return False, (e.lineno, e.offset)
+def _is_xml_doc(
+    checker_data: models.CheckerData,
+) -> tuple[bool, Optional[tuple[int, int]]]:
+    error = checker_data.xml_syntax_error
+    if error is not None:
+        logging.error(f"- Error: {error}")
+        logging.error(f"- Error occurred at line {error.lineno}, column {error.offset}")
+        return False, (error.lineno, error.offset)
+
+    if checker_data.input_file_xml_root is None:
+        raise FileNotFoundError(f"Cannot read input file {checker_data.xml_file_path}")
+
+    logging.info("- It is an xml document.")
+    return True, None
 
 
 def check_rule(checker_data: models.CheckerData) -> None:
@@ -40,7 +43,7 @@ def check_rule(checker_data: models.CheckerData) -> None:
     """
     logging.info("Executing valid_xml_document check")
 
-    is_valid, error_location = _is_xml_doc(checker_data.xml_file_path)
+    is_valid, error_location = _is_xml_doc(checker_data)
 
     if not is_valid:
         issue_id = checker_data.result.register_issue(
@@ -0,0 +1,122 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import dataclasses
+import json
+import os
+import time
+import tracemalloc
+
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator
+
+from qc_baselib import Result
+
+from qc_openscenario import constants
+from qc_openscenario.checks import models
+
+METRICS_FILE_EXTENSION = ".metrics.json"
+
+
+class CheckerMeasurement:
+    """Measures a checker from its creation until stop is called.
+    Memory is only measured if tracemalloc is tracing, see trace_memory.
+    """
+
+    def __init__(self):
+        self._memory_start = None
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+            self._memory_start = tracemalloc.get_traced_memory()[0]
+
+        self._cpu_start = time.thread_time()
+        self._wall_start = time.perf_counter()
+
+    def stop(self, issue_count: int) -> models.CheckerMetrics:
+        wall_time = time.perf_counter() - self._wall_start
+        cpu_time = time.thread_time() - self._cpu_start
+
+        peak_memory = None
+        if self._memory_start is not None and tracemalloc.is_tracing():
+            peak_memory = max(
+                0, tracemalloc.get_traced_memory()[1] - self._memory_start
+            )
+
+        return models.CheckerMetrics(
+            wall_time=wall_time,
+            cpu_time=cpu_time,
+            peak_memory=peak_memory,
+            issue_count=issue_count,
+        )
+
+
+@contextmanager
+def trace_memory(enabled: bool) -> Iterator[None]:
+    """Trace Python memory allocations within the block, if enabled and not
+    already traced by the caller. Tracing slows down the checks noticeably.
+    """
+    if not enabled or tracemalloc.is_tracing():
+        yield
+        return
+
+    tracemalloc.start()
+    try:
+        yield
+    finally:
+        tracemalloc.stop()
+
+
+def add_metrics_to_result(
+    result: Result, checker_metrics: Dict[str, models.CheckerMetrics]
+) -> None:
+    """Add the metrics of each checker as parameters of the checker in the result"""
+    for checker_id, metrics in checker_metrics.items():
+        params = {
+            "wallTime": metrics.wall_time,
+            "cpuTime": metrics.cpu_time,
+            "peakMemory": metrics.peak_memory,
+            "issueCount": metrics.issue_count,
+        }
+        for name, value in params.items():
+            if value is not None:
+                result.add_param_to_checker(
+                    checker_bundle_name=constants.BUNDLE_NAME,
+                    checker_id=checker_id,
+                    name=name,
+                    value=value,
+                )
+
+
+def get_metrics_file_path(result_file: str) -> str:
+    """Path of the metrics file written next to a result file"""
+    return os.path.splitext(result_file)[0] + METRICS_FILE_EXTENSION
+
+
+def write_metrics_file(
+    metrics_file: str,
+    input_file: str,
+    checker_metrics: Dict[str, models.CheckerMetrics],
+    checker_ids: Iterable[str],
+) -> None:
+    """Write the metrics of a document to a JSON file
+
+    Args:
+        metrics_file (str): path of the file to write
+        input_file (str): path of the checked document
+        checker_metrics (Dict[str, models.CheckerMetrics]): metrics of the checkers that ran
+        checker_ids (Iterable[str]): all the checkers, in the order of the file
+    """
+    content = {
+        "input_file": input_file,
+        "checkers": {
+            x: dataclasses.asdict(checker_metrics[x])
+            for x in checker_ids
+            if x in checker_metrics
+        },
+    }
+
+    with open(metrics_file, "w") as file:
+        json.dump(content, file, indent=2)
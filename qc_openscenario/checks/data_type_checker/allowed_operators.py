@@ -7,7 +7,7 @@
 import logging
 
 from dataclasses import dataclass
-from typing import Union, Optional
+from typing import List
 
 from lxml import etree
 
@@ -50,42 +50,27 @@ class ExpressionMember(enum.IntEnum):
     PARENTHESIS = 4
 
 
-@dataclass
-class QueueNode:
-    element: etree._ElementTree
-    xpath: Optional[str]
+# Attributes that can contain an expression, selected by libxml2 without
+# visiting the other attributes from Python
+DOLLAR_ATTRIBUTES_XPATH = etree.XPath('//@*[starts-with(., "$")]')
+
+TOKEN_PATTERN = re.compile(r"\$[A-Za-z_]\w*|\d+\.\d+|\d+|[\+\-\*/\^%()**//\{\}]|\w+")
+DECIMAL_NUMBER_PATTERN = re.compile(r"\d+\.\d+")
 
 
 @dataclass
 class AttributeInfo:
     name: str
     value: str
-    xpath: str
-
-
-def get_all_attributes(tree: etree._ElementTree, root: etree._Element):
-    attributes = []
-    stack = [
-        QueueNode(root, tree.getpath(root))
-    ]  # Initialize stack with the root element
-
-    while stack:
-        current_node = stack.pop()
-        current_element = current_node.element
-        current_xpath = current_node.xpath
-
-        # Process attributes of the current element
-        for attr, value in current_element.attrib.items():
-            attributes.append(AttributeInfo(attr, value, current_xpath))
+    element: etree._Element
 
-        # Push children to the stack for further processing
-        stack.extend(
-            reversed(
-                [QueueNode(x, tree.getpath(x)) for x in current_element.getchildren()]
-            )
-        )
 
-    return attributes
+def get_dollar_attributes(tree: etree._ElementTree) -> List[AttributeInfo]:
+    """Get all the attributes whose value starts with $, in document order"""
+    return [
+        AttributeInfo(value.attrname, str(value), value.getparent())
+        for value in DOLLAR_ATTRIBUTES_XPATH(tree)
+    ]
 
 
 def filter_expressions(attribute):
@@ -114,8 +99,7 @@ def check_rule(checker_data: models.CheckerData) -> None:
     logging.info("Executing allowed_operators check")
 
     tree = checker_data.input_file_xml_root
-    root = tree.getroot()
-    attributes = get_all_attributes(tree, root)
+    attributes = get_dollar_attributes(tree)
     filtered_attributes = list(filter(filter_expressions, attributes))
 
     logging.debug(f"attributes: {attributes}")
@@ -127,8 +111,7 @@ def check_rule(checker_data: models.CheckerData) -> None:
         logging.debug(f"expression_candidate: {expression_candidate}")
 
         # Tokenize the expression using regular expressions
-        token_pattern = r"\$[A-Za-z_]\w*|\d+\.\d+|\d+|[\+\-\*/\^%()**//\{\}]|\w+"
-        tokens = re.findall(token_pattern, expression_candidate)
+        tokens = TOKEN_PATTERN.findall(expression_candidate)
 
         token_type = None
         logging.debug(f"tokens: {tokens}")
@@ -137,7 +120,7 @@ def check_rule(checker_data: models.CheckerData) -> None:
                 token_type = ExpressionMember.VARIABLE
             elif token in ALLOWED_OPERANDS:
                 token_type = ExpressionMember.OPERATOR
-            elif re.match(r"\d+\.\d+", token) or token.isdigit():
+            elif DECIMAL_NUMBER_PATTERN.match(token) or token.isdigit():
                 token_type = ExpressionMember.NUMBER
             elif token in ["(", ")"]:
                 token_type = ExpressionMember.PARENTHESIS
@@ -151,7 +134,7 @@ def check_rule(checker_data: models.CheckerData) -> None:
             has_issue = token_type == ExpressionMember.INVALID
             if has_issue:
                 logging.debug(f"Invalid operand {token}")
-                xpath = attribute.xpath
+                xpath = tree.getpath(attribute.element)
 
                 issue_id = checker_data.result.register_issue(
                     checker_bundle_name=constants.BUNDLE_NAME,
@@ -41,8 +41,9 @@ def check_rule(checker_data: models.CheckerData) -> None:
     logging.info("Executing non_negative_transition_time_in_light_state_action check")
 
     root = checker_data.input_file_xml_root
+    index = checker_data.document_index
 
-    light_state_nodes = root.findall(".//LightStateAction")
+    light_state_nodes = index.get_elements_by_tag("LightStateAction")
 
     for light_state_node in light_state_nodes:
         current_transition_time = light_state_node.get("transitionTime")
@@ -59,7 +60,10 @@ def check_rule(checker_data: models.CheckerData) -> None:
         if current_transition_type == models.AttributeType.PARAMETER:
             current_transition_param_name = current_transition_time[1:]
             current_transition_param_value = utils.get_parameter_value_from_node(
-                root, light_state_node, current_transition_param_name
+                root,
+                light_state_node,
+                current_transition_param_name,
+                checker_data.parameter_scopes,
             )
             logging.debug(
                 f"current_transition_param_name: {current_transition_param_name}"
@@ -37,8 +37,9 @@ def check_rule(checker_data: models.CheckerData) -> None:
     logging.info("Executing positive_duration_in_phase check")
 
     root = checker_data.input_file_xml_root
+    index = checker_data.document_index
 
-    phase_nodes = root.findall(".//Phase")
+    phase_nodes = index.get_elements_by_tag("Phase")
 
     for phase_node in phase_nodes:
         current_duration = phase_node.get("duration")
@@ -55,7 +56,10 @@ def check_rule(checker_data: models.CheckerData) -> None:
         if current_duration_type == models.AttributeType.PARAMETER:
             current_duration_param_name = current_duration[1:]
             current_duration_param_value = utils.get_parameter_value_from_node(
-                root, phase_node, current_duration_param_name
+                root,
+                phase_node,
+                current_duration_param_name,
+                checker_data.parameter_scopes,
             )
             logging.debug(f"current_duration_param_name: {current_duration_param_name}")
             logging.debug(
@@ -4,14 +4,147 @@
 # Public License, v. 2.0. If a copy of the MPL was not distributed
 # with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from lxml import etree
-from typing import Optional
+from types import MappingProxyType
+from typing import Optional, List, Dict, Mapping, FrozenSet
 from enum import Enum
 
 from qc_baselib import Configuration, Result
 
 
+@dataclass
+class DocumentIndex:
+    """Lookup tables of the elements below the root of a document.
+    All element lists are in document order.
+
+    Sections holds a separate index for each of the anchors, containing only
+    the descendants of that anchor, for the lookups listed in
+    utils.SECTION_TAGS and utils.SECTION_ATTRIBUTES.
+    """
+
+    elements_by_tag: Dict[str, List[etree._Element]] = field(default_factory=dict)
+    elements_by_attribute: Dict[str, List[etree._Element]] = field(default_factory=dict)
+    elements_by_name: Dict[str, List[etree._Element]] = field(default_factory=dict)
+    entities: Optional[etree._Element] = None
+    storyboard: Optional[etree._Element] = None
+    road_network: Optional[etree._Element] = None
+    parameter_declarations: Optional[etree._Element] = None
+    variable_declarations: Optional[etree._Element] = None
+    sections: Dict[str, "DocumentIndex"] = field(default_factory=dict)
+
+    def get_elements_by_tag(self, tag: str) -> List[etree._Element]:
+        return self.elements_by_tag.get(tag, [])
+
+    def get_elements_by_attribute(self, attribute_name: str) -> List[etree._Element]:
+        return self.elements_by_attribute.get(attribute_name, [])
+
+    def get_elements_by_name(self, name: str) -> List[etree._Element]:
+        return self.elements_by_name.get(name, [])
+
+    def get_section(self, tag: str) -> "DocumentIndex":
+        """Index of the descendants of the anchor with the given tag.
+        An empty index if the anchor is not present."""
+        return self.sections.get(tag, DocumentIndex())
+
+
+@dataclass(frozen=True)
+class RoadNetworkFacts:
+    """Facts extracted from an OpenDRIVE file"""
+
+    signal_ids: FrozenSet[str]
+    controller_ids: FrozenSet[str]
+    junction_ids: FrozenSet[str]
+
+
+_NOT_DECLARED = object()
+
+
+@dataclass(frozen=True, eq=False)
+class ParameterScope:
+    """Parameters declared by one element, chained to the scope of the closest
+    enclosing element that declares parameters. Results of lookups are cached.
+    """
+
+    declarations: Mapping[str, Optional[str]]
+    parent: Optional["ParameterScope"]
+    _lookup_cache: Dict[str, Optional[str]] = field(default_factory=dict, repr=False)
+
+    def lookup(self, parameter_name: str) -> Optional[str]:
+        value = self._lookup_cache.get(parameter_name, _NOT_DECLARED)
+        if value is not _NOT_DECLARED:
+            return value
+
+        if parameter_name in self.declarations:
+            value = self.declarations[parameter_name]
+        elif self.parent is not None:
+            value = self.parent.lookup(parameter_name)
+        else:
+            value = None
+
+        self._lookup_cache[parameter_name] = value
+        return value
+
+
+class ParameterScopeTable:
+    """Maps elements to the innermost ParameterScope visible from them"""
+
+    def __init__(self) -> None:
+        self._scopes: Dict[etree._Element, Optional[ParameterScope]] = {}
+
+    def add_scope(
+        self, element: etree._Element, declarations: Dict[str, Optional[str]]
+    ) -> ParameterScope:
+        """Register the parameters declared by element. Scopes of the enclosing
+        elements must be registered first."""
+        scope = ParameterScope(
+            declarations=MappingProxyType(declarations),
+            parent=self.get_scope(element.getparent()),
+        )
+        self._scopes[element] = scope
+        return scope
+
+    def get_scope(self, element: Optional[etree._Element]) -> Optional[ParameterScope]:
+        # Walk up to the first element with a known scope, and remember the
+        # result for every element on the way so later lookups stop earlier
+        visited = []
+        scope = None
+        current = element
+        while current is not None:
+            if current in self._scopes:
+                scope = self._scopes[current]
+                break
+            visited.append(current)
+            current = current.getparent()
+
+        for visited_element in visited:
+            self._scopes[visited_element] = scope
+
+        return scope
+
+    def get_parameter_value(
+        self, element: etree._Element, parameter_name: str
+    ) -> Optional[str]:
+        scope = self.get_scope(element)
+        if scope is None:
+            return None
+        return scope.lookup(parameter_name)
+
+
+@dataclass(frozen=True)
+class CheckerMetrics:
+    """Cost of one checker run on one document"""
+
+    # Elapsed time in seconds
+    wall_time: float
+    # CPU time in seconds of the thread running the checker
+    cpu_time: float
+    # Peak of the memory allocated by Python code while the checker ran, in
+    # bytes. None if memory is not traced
+    peak_memory: Optional[int]
+    issue_count: int
+
+
 @dataclass
 class CheckerData:
     xml_file_path: str
@@ -19,7 +152,13 @@ class CheckerData:
     config: Configuration
     result: Result
     schema_version: Optional[str]
-    xodr_root: Optional[etree._ElementTree]
+    road_network_facts: Optional[RoadNetworkFacts]
+    xml_syntax_error: Optional[etree.XMLSyntaxError] = None
+    validated_schema_version: Optional[str] = None
+    document_index: Optional[DocumentIndex] = None
+    parameter_scopes: Optional[ParameterScopeTable] = None
+    # Metrics of each checker that ran, if they are collected
+    checker_metrics: Optional[Dict[str, CheckerMetrics]] = None
 
 
 class AttributeType(Enum):
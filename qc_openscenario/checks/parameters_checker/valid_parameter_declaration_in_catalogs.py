@@ -39,8 +39,9 @@ def check_rule(checker_data: models.CheckerData) -> None:
     logging.info("Executing valid_parameter_declaration_in_catalogs check")
 
     root = checker_data.input_file_xml_root
+    index = checker_data.document_index
 
-    catalogs_node = root.findall(".//Catalog")
+    catalogs_node = index.get_elements_by_tag("Catalog")
     if catalogs_node is None:
         logging.error("Cannot find Catalog nodes in provided XOSC file. Skipping check")
 
@@ -36,8 +36,9 @@ def check_rule(checker_data: models.CheckerData) -> None:
     logging.info("Executing resolvable_entity_references check")
 
     root = checker_data.input_file_xml_root
+    index = checker_data.document_index
 
-    entities_node = root.find("Entities")
+    entities_node = index.entities
     if entities_node is None:
         checker_data.result.set_checker_status(
             checker_bundle_name=constants.BUNDLE_NAME,
@@ -60,7 +61,7 @@ def check_rule(checker_data: models.CheckerData) -> None:
             defined_entities.add(current_name)
 
     logging.debug(f"Defined entities : {defined_entities}")
-    storyboard_node = root.find("Storyboard")
+    storyboard_node = index.storyboard
     if storyboard_node is None:
         checker_data.result.set_checker_status(
             checker_bundle_name=constants.BUNDLE_NAME,
@@ -76,7 +77,9 @@ def check_rule(checker_data: models.CheckerData) -> None:
 
         return
 
-    nodes_with_entity_ref = storyboard_node.xpath(".//*[@entityRef]")
+    nodes_with_entity_ref = index.get_section("Storyboard").get_elements_by_attribute(
+        "entityRef"
+    )
 
     for node_with_entity_ref in nodes_with_entity_ref:
         current_entity_ref = node_with_entity_ref.get("entityRef")
@@ -93,7 +96,10 @@ def check_rule(checker_data: models.CheckerData) -> None:
         ):
             current_entity_param_name = current_entity_ref[1:]
             current_entity_param_value = utils.get_parameter_value_from_node(
-                root, node_with_entity_ref, current_entity_param_name
+                root,
+                node_with_entity_ref,
+                current_entity_param_name,
+                checker_data.parameter_scopes,
             )
             logging.debug(f"current_entity_param_name: {current_entity_param_name}")
             logging.debug(f"current_entity_param_value: {current_entity_param_value}")
@@ -36,8 +36,9 @@ def check_rule(checker_data: models.CheckerData) -> None:
     logging.info("Executing resolvable_signal_id_in_traffic_signal_state_action check")
 
     root = checker_data.input_file_xml_root
+    index = checker_data.document_index
 
-    if checker_data.xodr_root is None:
+    if checker_data.road_network_facts is None:
         checker_data.result.set_checker_status(
             checker_bundle_name=constants.BUNDLE_NAME,
             checker_id=CHECKER_ID,
@@ -52,30 +53,9 @@ def check_rule(checker_data: models.CheckerData) -> None:
 
         return
 
-    xodr_signal_list = checker_data.xodr_root.findall(".//signal")
+    xodr_signal_ids = checker_data.road_network_facts.signal_ids
 
-    if xodr_signal_list is None:
-        checker_data.result.set_checker_status(
-            checker_bundle_name=constants.BUNDLE_NAME,
-            checker_id=CHECKER_ID,
-            status=StatusType.SKIPPED,
-        )
-
-        checker_data.result.add_checker_summary(
-            constants.BUNDLE_NAME,
-            CHECKER_ID,
-            "Cannot read signals from xodr file. Skip the check.",
-        )
-
-        return
-
-    xodr_signal_ids = set()
-    for xodr_signal in xodr_signal_list:
-        signal_id = xodr_signal.get("id")
-        if signal_id is not None:
-            xodr_signal_ids.add(signal_id)
-
-    xosc_traffic_lights = root.findall(".//TrafficSignalStateAction")
+    xosc_traffic_lights = index.get_elements_by_tag("TrafficSignalStateAction")
 
     for xosc_traffic_light in xosc_traffic_lights:
         current_name = xosc_traffic_light.get("name")
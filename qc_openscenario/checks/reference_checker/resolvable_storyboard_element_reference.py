@@ -20,7 +20,7 @@ RULE_UID = (
     "asam.net:xosc:1.2.0:reference_control.resolvable_storyboard_element_reference"
 )
 
-STORYBOARD_ELEMENTS = ["Act", "Action", "Event", "Maneuver", "ManeuverGroup", " Story"]
+STORYBOARD_ELEMENTS = ["Act", "Action", "Event", "Maneuver", "ManeuverGroup", "Story"]
 
 
 def check_rule(checker_data: models.CheckerData) -> None:
@@ -42,8 +42,9 @@ def check_rule(checker_data: models.CheckerData) -> None:
     logging.info("Executing resolvable_storyboard_element_reference check")
 
     root = checker_data.input_file_xml_root
+    index = checker_data.document_index
 
-    storyboard_node = root.find("Storyboard")
+    storyboard_node = index.storyboard
     if storyboard_node is None:
         checker_data.result.set_checker_status(
             checker_bundle_name=constants.BUNDLE_NAME,
@@ -58,8 +59,11 @@ def check_rule(checker_data: models.CheckerData) -> None:
         )
         return
 
-    xpath_expr = "|".join([f"//{node}" for node in STORYBOARD_ELEMENTS])
-    storyboard_elements = storyboard_node.xpath(xpath_expr)
+    storyboard_elements = [
+        element
+        for tag in STORYBOARD_ELEMENTS
+        for element in index.get_elements_by_tag(tag)
+    ]
     if storyboard_elements is None:
         checker_data.result.set_checker_status(
             checker_bundle_name=constants.BUNDLE_NAME,
@@ -94,7 +98,9 @@ def check_rule(checker_data: models.CheckerData) -> None:
     logging.debug(f"storyboard_element_type_dict: {storyboard_element_type}")
     logging.debug(f"storyboard_element_occurrences: {storyboard_element_occurrences}")
 
-    nodes_with_storyboard_el_ref = storyboard_node.xpath(".//*[@storyboardElementRef]")
+    nodes_with_storyboard_el_ref = index.get_section(
+        "Storyboard"
+    ).get_elements_by_attribute("storyboardElementRef")
 
     for node_with_storyboard_el_ref in nodes_with_storyboard_el_ref:
         current_storyboard_el_ref = node_with_storyboard_el_ref.get(
@@ -113,7 +119,10 @@ def check_rule(checker_data: models.CheckerData) -> None:
         ):
             current_entity_param_name = current_storyboard_el_ref[1:]
             current_entity_param_value = utils.get_parameter_value_from_node(
-                root, node_with_storyboard_el_ref, current_entity_param_name
+                root,
+                node_with_storyboard_el_ref,
+                current_entity_param_name,
+                checker_data.parameter_scopes,
             )
             logging.debug(f"current_st_el_param_name: {current_entity_param_name}")
             logging.debug(f"current_st_el_param_value: {current_entity_param_value}")
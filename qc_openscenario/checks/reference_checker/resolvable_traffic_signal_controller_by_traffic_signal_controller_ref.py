@@ -39,8 +39,9 @@ def check_rule(checker_data: models.CheckerData) -> None:
     )
 
     root = checker_data.input_file_xml_root
+    index = checker_data.document_index
 
-    road_network = root.find("RoadNetwork")
+    road_network = index.road_network
     if road_network is None:
         checker_data.result.set_checker_status(
             checker_bundle_name=constants.BUNDLE_NAME,
@@ -57,7 +58,9 @@ def check_rule(checker_data: models.CheckerData) -> None:
         return
 
     # ts = traffic signal
-    ts_controllers = road_network.findall(".//TrafficSignalController")
+    ts_controllers = index.get_section("RoadNetwork").get_elements_by_tag(
+        "TrafficSignalController"
+    )
     if ts_controllers is None:
         checker_data.result.set_checker_status(
             checker_bundle_name=constants.BUNDLE_NAME,
@@ -79,7 +82,7 @@ def check_rule(checker_data: models.CheckerData) -> None:
         if current_name is not None:
             ts_controller_names.add(current_name)
 
-    ts_controller_actions = root.findall(".//TrafficSignalControllerAction")
+    ts_controller_actions = index.get_elements_by_tag("TrafficSignalControllerAction")
 
     for ts_controller in ts_controller_actions:
         current_name = ts_controller.get("trafficSignalControllerRef")
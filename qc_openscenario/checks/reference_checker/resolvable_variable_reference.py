@@ -37,9 +37,10 @@ def check_rule(checker_data: models.CheckerData) -> None:
     logging.info("Executing resolvable_variable_reference check")
 
     root = checker_data.input_file_xml_root
+    index = checker_data.document_index
 
-    parameter_declaration_nodes = root.find("ParameterDeclarations")
-    variable_declaration_nodes = root.find("VariableDeclarations")
+    parameter_declaration_nodes = index.parameter_declarations
+    variable_declaration_nodes = index.variable_declarations
 
     # Get parameters and variables declarations
     defined_param_variables = set()
@@ -55,7 +56,7 @@ def check_rule(checker_data: models.CheckerData) -> None:
             if current_name is not None:
                 defined_param_variables.add(current_name)
 
-    storyboard_node = root.find("Storyboard")
+    storyboard_node = index.storyboard
     if storyboard_node is None:
         checker_data.result.set_checker_status(
             checker_bundle_name=constants.BUNDLE_NAME,
@@ -71,7 +72,9 @@ def check_rule(checker_data: models.CheckerData) -> None:
 
         return
 
-    nodes_with_variable_ref = storyboard_node.xpath(".//*[@variableRef]")
+    nodes_with_variable_ref = index.get_section("Storyboard").get_elements_by_attribute(
+        "variableRef"
+    )
 
     for node_with_variable_ref in nodes_with_variable_ref:
         current_name = node_with_variable_ref.get("variableRef")
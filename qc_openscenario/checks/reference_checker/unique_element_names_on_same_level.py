@@ -7,7 +7,6 @@
 import logging
 
 from dataclasses import dataclass
-from typing import Optional
 
 from lxml import etree
 
@@ -17,7 +16,6 @@ from qc_openscenario import constants
 from qc_openscenario.checks import models
 
 from qc_openscenario import basic_preconditions
-from collections import deque, defaultdict
 
 CHECKER_ID = "check_asam_xosc_reference_control_unique_element_names_on_same_level"
 CHECKER_DESCRIPTION = "Element names at each level shall be unique at that level."
@@ -25,12 +23,6 @@ CHECKER_PRECONDITIONS = basic_preconditions.CHECKER_PRECONDITIONS
 RULE_UID = "asam.net:xosc:1.2.0:reference_control.unique_element_names_on_same_level"
 
 
-@dataclass
-class QueueNode:
-    element: etree._ElementTree
-    parent_xpath: Optional[str]
-
-
 @dataclass
 class DuplicateOccurrence:
     name: str
@@ -38,30 +30,27 @@ class DuplicateOccurrence:
 
 
 def are_names_unique_at_each_level(tree: etree._ElementTree, root: etree._Element):
-    # Initialize a queue for breadth-first traversal
-    queue = deque([QueueNode(root, None)])
-    levels_dict = defaultdict(set)
-
     duplicates = []
 
-    while queue:
-        queue_node = queue.popleft()
+    # Every element is visited once as a parent, and only the names of its
+    # direct children are kept while visiting it
+    for parent in root.iter(etree.Element):
+        sibling_names = set()
+
+        for child in parent.iterchildren(etree.Element):
+            current_name = child.get("name")
+            # Check if the element has a 'name' attribute
+            if current_name is None:
+                continue
 
-        current_element = queue_node.element
-        current_name = current_element.get("name")
-        parent_xpath = queue_node.parent_xpath
-        current_xpath = tree.getpath(current_element)
-        # Check if the element has a 'name' attribute
-        if current_name is not None:
             # Check for duplicate names at the current level
-            if current_name in levels_dict[parent_xpath]:
+            if current_name in sibling_names:
                 logging.debug(f"Duplicated name found : {current_name}")
-                duplicates.append(DuplicateOccurrence(current_name, current_xpath))
-            levels_dict[parent_xpath].add(current_name)
-
-        # Add children to the stack with incremented level
-        for child in current_element.getchildren():
-            queue.append(QueueNode(child, current_xpath))
+                duplicates.append(
+                    DuplicateOccurrence(current_name, tree.getpath(child))
+                )
+            else:
+                sibling_names.add(current_name)
 
     return duplicates
 
@@ -46,12 +46,13 @@ def check_rule(checker_data: models.CheckerData) -> None:
     logging.info("Executing uniquely_resolvable_entity_references check")
 
     root = checker_data.input_file_xml_root
+    index = checker_data.document_index
 
     # List to store problematic nodes
     errors = []
 
     # Iterate over each 'Catalog' node
-    for catalog_node in root.findall(".//Catalog"):
+    for catalog_node in index.get_elements_by_tag("Catalog"):
         # Dictionary to track child nodes by 'name' attribute
         child_names = {}
 
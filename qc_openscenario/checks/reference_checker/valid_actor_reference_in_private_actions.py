@@ -43,8 +43,9 @@ def check_rule(checker_data: models.CheckerData) -> None:
     logging.info("Executing valid_actor_reference_in_private_actions check")
 
     root = checker_data.input_file_xml_root
+    index = checker_data.document_index
 
-    maneuver_groups = root.findall(".//ManeuverGroup")
+    maneuver_groups = index.get_elements_by_tag("ManeuverGroup")
     if maneuver_groups is None:
         checker_data.result.set_checker_status(
             checker_bundle_name=constants.BUNDLE_NAME,
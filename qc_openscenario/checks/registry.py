@@ -0,0 +1,198 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import types
+
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Iterable, List, Optional
+
+from qc_openscenario.checks import utils
+from qc_openscenario.checks import basic_checker
+from qc_openscenario.checks import schema_checker
+from qc_openscenario.checks import reference_checker
+from qc_openscenario.checks import parameters_checker
+from qc_openscenario.checks import data_type_checker
+from qc_openscenario.schema import schema_files
+
+
+@dataclass(frozen=True)
+class CheckerSpec:
+    """Metadata of a checker module, collected once when it is registered"""
+
+    module: types.ModuleType
+    checker_id: str
+    description: str
+    preconditions: FrozenSet[str]
+    rule_uid: str
+    # Version of the standard from which the rule applies, e.g. "1.2.0"
+    definition_setting: str
+    # Basic checkers run on the bare tree, before the document index is
+    # built, and apply to all versions
+    basic: bool
+
+
+def _create_spec(checker: types.ModuleType, basic: bool) -> CheckerSpec:
+    splitted_rule_uid = checker.RULE_UID.split(":")
+    if len(splitted_rule_uid) != 4:
+        raise RuntimeError(f"Invalid rule uid: {checker.RULE_UID}")
+
+    return CheckerSpec(
+        module=checker,
+        checker_id=checker.CHECKER_ID,
+        description=checker.CHECKER_DESCRIPTION,
+        preconditions=frozenset(checker.CHECKER_PRECONDITIONS),
+        rule_uid=checker.RULE_UID,
+        definition_setting=splitted_rule_uid[2],
+        basic=basic,
+    )
+
+
+class CheckerRegistry:
+    """Dependency graph of a set of checkers.
+    The checkers are ordered topologically according to their preconditions,
+    keeping the registration order between independent checkers, and the
+    checkers applying to each known schema version are computed upfront.
+    """
+
+    def __init__(
+        self,
+        basic_checkers: Iterable[types.ModuleType],
+        document_checkers: Iterable[types.ModuleType],
+    ):
+        """
+        Args:
+            basic_checkers (Iterable[types.ModuleType]): checkers of the bare tree
+            document_checkers (Iterable[types.ModuleType]): checkers run once
+                the document index is built
+
+        Raises:
+            ValueError: if a precondition is not registered, a basic checker
+                depends on a document checker, or the preconditions form a cycle
+        """
+        specs = [_create_spec(x, basic=True) for x in basic_checkers]
+        specs += [_create_spec(x, basic=False) for x in document_checkers]
+
+        self._specs_by_id: Dict[str, CheckerSpec] = {}
+        for spec in specs:
+            if spec.checker_id in self._specs_by_id:
+                raise ValueError(f"Checker {spec.checker_id} is registered twice")
+            self._specs_by_id[spec.checker_id] = spec
+
+        for spec in specs:
+            for precondition in spec.preconditions:
+                precondition_spec = self._specs_by_id.get(precondition)
+                if precondition_spec is None:
+                    raise ValueError(
+                        f"Precondition {precondition} of {spec.checker_id} is not registered"
+                    )
+                if spec.basic and not precondition_spec.basic:
+                    raise ValueError(
+                        f"Basic checker {spec.checker_id} depends on {precondition}"
+                    )
+
+        self.checkers: List[CheckerSpec] = self._sort_topologically(specs)
+        self.basic_checkers = [x for x in self.checkers if x.basic]
+        self.document_checkers = [x for x in self.checkers if not x.basic]
+
+        self._enabled_checker_ids: Dict[Optional[str], FrozenSet[str]] = {}
+        for schema_version in schema_files.SCHEMA_FILES:
+            self.get_enabled_checker_ids(schema_version)
+
+    @staticmethod
+    def _sort_topologically(specs: List[CheckerSpec]) -> List[CheckerSpec]:
+        ordered = []
+        ordered_ids = set()
+        remaining = list(specs)
+
+        while remaining:
+            # Take the first registered checker whose preconditions are all done
+            for spec in remaining:
+                if spec.preconditions <= ordered_ids:
+                    break
+            else:
+                raise ValueError(
+                    "Cyclic preconditions between "
+                    + ", ".join(x.checker_id for x in remaining)
+                )
+
+            remaining.remove(spec)
+            ordered.append(spec)
+            ordered_ids.add(spec.checker_id)
+
+        return ordered
+
+    def get(self, checker_id: str) -> CheckerSpec:
+        """Get a registered checker
+
+        Raises:
+            ValueError: if the checker is not registered
+        """
+        spec = self._specs_by_id.get(checker_id)
+        if spec is None:
+            raise ValueError(f"Unknown checker {checker_id}")
+        return spec
+
+    def select(self, checker_ids: Iterable[str]) -> FrozenSet[str]:
+        """Get the given checkers along with all the checkers they depend on
+
+        Raises:
+            ValueError: if a checker is not registered
+        """
+        selected_ids = set()
+        pending_ids = list(checker_ids)
+        while pending_ids:
+            spec = self.get(pending_ids.pop())
+            if spec.checker_id not in selected_ids:
+                selected_ids.add(spec.checker_id)
+                pending_ids.extend(spec.preconditions)
+
+        return frozenset(selected_ids)
+
+    def get_enabled_checker_ids(self, schema_version: Optional[str]) -> FrozenSet[str]:
+        """Get the checkers whose rules apply to a version of the standard.
+        Basic checkers apply to all versions, other checkers only apply from
+        their definition setting on, and not at all if the version is unknown.
+        """
+        enabled_ids = self._enabled_checker_ids.get(schema_version)
+        if enabled_ids is not None:
+            return enabled_ids
+
+        enabled_ids = frozenset(
+            spec.checker_id
+            for spec in self.checkers
+            if spec.basic
+            or (
+                schema_version is not None
+                and utils.compare_versions(schema_version, spec.definition_setting) >= 0
+            )
+        )
+        self._enabled_checker_ids[schema_version] = enabled_ids
+        return enabled_ids
+
+
+CHECKER_REGISTRY = CheckerRegistry(
+    basic_checkers=[
+        basic_checker.valid_xml_document,
+        basic_checker.root_tag_is_openscenario,
+        basic_checker.fileheader_is_present,
+        basic_checker.version_is_defined,
+    ],
+    document_checkers=[
+        schema_checker.valid_schema,
+        reference_checker.uniquely_resolvable_entity_references,
+        reference_checker.resolvable_signal_id_in_traffic_signal_state_action,
+        reference_checker.resolvable_traffic_signal_controller_by_traffic_signal_controller_ref,
+        reference_checker.valid_actor_reference_in_private_actions,
+        reference_checker.resolvable_entity_references,
+        reference_checker.resolvable_variable_reference,
+        reference_checker.resolvable_storyboard_element_reference,
+        reference_checker.unique_element_names_on_same_level,
+        parameters_checker.valid_parameter_declaration_in_catalogs,
+        data_type_checker.allowed_operators,
+        data_type_checker.non_negative_transition_time_in_light_state_action,
+        data_type_checker.positive_duration_in_phase,
+    ],
+)
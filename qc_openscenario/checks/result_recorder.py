@@ -0,0 +1,133 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import logging
+import sys
+
+from typing import Dict, List, Optional, Tuple, Union
+
+from qc_baselib import IssueSeverity, Result, StatusType
+
+
+class ResultRecorder:
+    """Stands in for the Result of a document while checkers run concurrently.
+    Each checker writes to its own recorder, hence never shares state with
+    other threads. The recorded calls are replayed on the actual Result
+    afterwards, by a single thread and in a fixed checker order, so that the
+    issue ids and the order of the output do not depend on the scheduling.
+
+    Only the methods of Result used by execute_checker and the checkers are
+    available. Errors of the checker are logged on replay as well, so that
+    nothing is logged for a discarded recording.
+    """
+
+    def __init__(self):
+        self._calls: List[Tuple[str, dict]] = []
+        self._statuses: Dict[str, StatusType] = {}
+        self._issue_counts: Dict[str, int] = {}
+        self._next_issue_id = 0
+        self._exceptions: List[Tuple[str, BaseException]] = []
+
+    def register_checker(
+        self,
+        checker_bundle_name: str,
+        checker_id: str,
+        description: str,
+        summary: str = "",
+    ) -> None:
+        self._calls.append(("register_checker", locals()))
+        self._issue_counts[checker_id] = 0
+
+    def register_rule_by_uid(
+        self, checker_bundle_name: str, checker_id: str, rule_uid: str
+    ) -> None:
+        self._calls.append(("register_rule_by_uid", locals()))
+
+    def register_issue(
+        self,
+        checker_bundle_name: str,
+        checker_id: str,
+        description: str,
+        level: IssueSeverity,
+        rule_uid: str,
+    ) -> int:
+        self._calls.append(("register_issue", locals()))
+        self._issue_counts[checker_id] += 1
+
+        # Recorded ids are replaced by the ids of the actual Result on replay
+        issue_id = self._next_issue_id
+        self._next_issue_id += 1
+        return issue_id
+
+    def add_xml_location(
+        self,
+        checker_bundle_name: str,
+        checker_id: str,
+        issue_id: int,
+        xpath: Union[str, List[str]],
+        description: str,
+        coalesce: bool = True,
+    ) -> None:
+        self._calls.append(("add_xml_location", locals()))
+
+    def add_file_location(
+        self,
+        checker_bundle_name: str,
+        checker_id: str,
+        issue_id: int,
+        row: Optional[int],
+        column: Optional[int],
+        description: str,
+        offset: Optional[int] = None,
+        coalesce: bool = True,
+    ) -> None:
+        self._calls.append(("add_file_location", locals()))
+
+    def set_checker_status(
+        self, checker_bundle_name: str, checker_id: str, status: StatusType
+    ) -> None:
+        self._calls.append(("set_checker_status", locals()))
+        self._statuses[checker_id] = status
+
+    def add_checker_summary(
+        self, checker_bundle_name: str, checker_id: str, content: str
+    ) -> None:
+        self._calls.append(("add_checker_summary", locals()))
+
+    def log_exception(self, message: str) -> None:
+        """Record the exception being handled, logged with its traceback on
+        replay, see logging.exception"""
+        self._exceptions.append((message, sys.exc_info()[1]))
+
+    def get_checker_status(self, checker_id: str) -> Optional[StatusType]:
+        return self._statuses.get(checker_id)
+
+    def get_checker_issue_count(self, checker_bundle_name: str, checker_id: str) -> int:
+        return self._issue_counts[checker_id]
+
+    def replay(self, result: Result) -> None:
+        """Apply the recorded calls to the actual result, in their order
+
+        Args:
+            result (Result): the result of the document
+        """
+        issue_ids = {}
+
+        for method_name, arguments in self._calls:
+            arguments = {x: y for x, y in arguments.items() if x != "self"}
+
+            if method_name == "register_issue":
+                # Recorded ids are given in sequence from 0
+                issue_ids[len(issue_ids)] = result.register_issue(**arguments)
+                continue
+
+            if "issue_id" in arguments:
+                arguments["issue_id"] = issue_ids[arguments["issue_id"]]
+
+            getattr(result, method_name)(**arguments)
+
+        for message, exception in self._exceptions:
+            logging.error(message, exc_info=exception)
@@ -0,0 +1,197 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from qc_openscenario.checks import models
+
+# A cache key identifies the content of a file by its absolute path, size and
+# modification time, so an edited file is never served from the cache
+CacheKey = Tuple[str, int, int]
+
+MEMORY_CACHE_MAX_ENTRIES = 128
+DISK_CACHE_DEFAULT_MAX_SIZE = 64 * 1024 * 1024
+DISK_CACHE_FILE_EXTENSION = ".facts.json"
+# Bumped when the facts collected from a file change, to ignore older entries
+DISK_CACHE_FORMAT_VERSION = 2
+
+_memory_cache: "OrderedDict[CacheKey, models.RoadNetworkFacts]" = OrderedDict()
+_memory_cache_lock = threading.Lock()
+_disk_cache_lock = threading.Lock()
+
+
+def get_cache_key(path: str) -> Optional[CacheKey]:
+    """Get the cache key of a file
+
+    Args:
+        path (str): path of the file
+
+    Returns:
+        Optional[CacheKey]: the cache key. None if the file does not exist
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+
+    return os.path.abspath(path), stat.st_size, stat.st_mtime_ns
+
+
+def _get_disk_cache_file_path(cache_dir: str, key: CacheKey) -> str:
+    digest = hashlib.sha256(
+        json.dumps([DISK_CACHE_FORMAT_VERSION, key]).encode()
+    ).hexdigest()
+    return os.path.join(cache_dir, digest + DISK_CACHE_FILE_EXTENSION)
+
+
+def _load_from_disk(cache_dir: str, key: CacheKey) -> Optional[models.RoadNetworkFacts]:
+    cache_file_path = _get_disk_cache_file_path(cache_dir, key)
+
+    try:
+        with open(cache_file_path, "r") as cache_file:
+            content = json.load(cache_file)
+        # Mark the entry as recently used for the eviction
+        os.utime(cache_file_path)
+    except (OSError, ValueError):
+        return None
+
+    if content.get("key") != list(key):
+        return None
+
+    return models.RoadNetworkFacts(
+        signal_ids=frozenset(content["signal_ids"]),
+        controller_ids=frozenset(content["controller_ids"]),
+        junction_ids=frozenset(content["junction_ids"]),
+    )
+
+
+def _evict_from_disk(cache_dir: str, max_size: int) -> None:
+    entries = []
+    for file_name in os.listdir(cache_dir):
+        if not file_name.endswith(DISK_CACHE_FILE_EXTENSION):
+            continue
+        try:
+            stat = os.stat(os.path.join(cache_dir, file_name))
+        except OSError:
+            continue
+        entries.append((stat.st_mtime_ns, stat.st_size, file_name))
+
+    total_size = sum(size for _, size, _ in entries)
+
+    # Remove the least recently used entries first
+    for _, size, file_name in sorted(entries):
+        if total_size <= max_size:
+            break
+        try:
+            os.remove(os.path.join(cache_dir, file_name))
+        except OSError:
+            continue
+        total_size -= size
+
+
+def _store_to_disk(
+    cache_dir: str,
+    max_size: int,
+    key: CacheKey,
+    road_network_facts: models.RoadNetworkFacts,
+) -> None:
+    content = {
+        "key": list(key),
+        "signal_ids": sorted(road_network_facts.signal_ids),
+        "controller_ids": sorted(road_network_facts.controller_ids),
+        "junction_ids": sorted(road_network_facts.junction_ids),
+    }
+
+    with _disk_cache_lock:
+        os.makedirs(cache_dir, exist_ok=True)
+
+        # Write to a temporary file first so that concurrent readers, also
+        # from other processes, never see a partially written entry
+        file_descriptor, temporary_path = tempfile.mkstemp(dir=cache_dir)
+        with os.fdopen(file_descriptor, "w") as cache_file:
+            json.dump(content, cache_file)
+        os.replace(temporary_path, _get_disk_cache_file_path(cache_dir, key))
+
+        _evict_from_disk(cache_dir, max_size)
+
+
+def load(
+    key: CacheKey, cache_dir: Optional[str] = None
+) -> Optional[models.RoadNetworkFacts]:
+    """Get the road network facts of a file from the cache
+
+    Args:
+        key (CacheKey): cache key of the file
+        cache_dir (Optional[str]): directory of the persistent cache. Only the
+            in-memory cache is used if not specified
+
+    Returns:
+        Optional[models.RoadNetworkFacts]: the cached facts. None if not found
+    """
+    with _memory_cache_lock:
+        road_network_facts = _memory_cache.get(key)
+        if road_network_facts is not None:
+            _memory_cache.move_to_end(key)
+            return road_network_facts
+
+    if cache_dir is None:
+        return None
+
+    road_network_facts = _load_from_disk(cache_dir, key)
+    if road_network_facts is not None:
+        logging.debug(f"Road network facts of {key[0]} loaded from {cache_dir}")
+        _store_to_memory(key, road_network_facts)
+
+    return road_network_facts
+
+
+def _store_to_memory(key: CacheKey, road_network_facts: models.RoadNetworkFacts):
+    with _memory_cache_lock:
+        _memory_cache[key] = road_network_facts
+        _memory_cache.move_to_end(key)
+        while len(_memory_cache) > MEMORY_CACHE_MAX_ENTRIES:
+            _memory_cache.popitem(last=False)
+
+
+def store(
+    key: CacheKey,
+    road_network_facts: models.RoadNetworkFacts,
+    cache_dir: Optional[str] = None,
+    max_disk_size: int = DISK_CACHE_DEFAULT_MAX_SIZE,
+) -> None:
+    """Add the road network facts of a file to the cache
+
+    Args:
+        key (CacheKey): cache key of the file
+        road_network_facts (models.RoadNetworkFacts): facts extracted from the file
+        cache_dir (Optional[str]): directory of the persistent cache. Only the
+            in-memory cache is used if not specified
+        max_disk_size (int): size in bytes above which the least recently used
+            entries of the persistent cache are removed
+    """
+    _store_to_memory(key, road_network_facts)
+
+    if cache_dir is None:
+        return
+
+    try:
+        _store_to_disk(cache_dir, max_disk_size, key, road_network_facts)
+    except OSError as e:
+        logging.warning(f"Cannot write road network facts to {cache_dir}: {e}")
+
+
+def clear() -> None:
+    """Remove all the entries of the in-memory cache"""
+    with _memory_cache_lock:
+        _memory_cache.clear()
@@ -4,7 +4,6 @@
 # Public License, v. 2.0. If a copy of the MPL was not distributed
 # with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
 
-import importlib.resources
 import logging
 
 from lxml import etree
@@ -12,7 +11,7 @@ from lxml import etree
 from qc_baselib import IssueSeverity, StatusType
 
 from qc_openscenario import constants
-from qc_openscenario.schema import schema_files
+from qc_openscenario.schema import schema_files, schema_registry
 from qc_openscenario.checks import models
 
 from qc_openscenario.checks.basic_checker import (
@@ -34,31 +33,29 @@ RULE_UID = "asam.net:xosc:1.0.0:xml.valid_schema"
 
 
 def _is_schema_compliant(
-    xml_tree: etree._ElementTree, schema_file: str
+    xml_tree: etree._ElementTree, schema_version: str
 ) -> tuple[bool, etree._ListErrorLog]:
-    """Check if input xml tree  is valid against the input schema file (.xsd)
+    """Check if input xml tree  is valid against the schema of the input version
 
     Args:
-        xml_file (etree._ElementTree): XML tree to test
-        schema_file (str): XSD file path containing the schema for the validation
+        xml_tree (etree._ElementTree): XML tree to test
+        schema_version (str): OpenSCENARIO version whose compiled schema is used for the validation
 
     Returns:
-        bool: True if file pointed by xml_file is valid w.r.t. input schema file. False otherwise
+        bool: True if xml_tree is valid w.r.t. the schema of the version. False otherwise
     """
-    with open(schema_file, "rb") as schema_f:
-        schema_doc = etree.parse(schema_f)
-        schema = etree.XMLSchema(schema_doc)
+    is_valid, error_log = schema_registry.validate(schema_version, xml_tree)
 
-    if schema.validate(xml_tree):
+    if is_valid:
         logging.info("- XML is valid.")
         return True, None
     else:
         logging.error("- XML is invalid!")
-        for error in schema.error_log:
+        for error in error_log:
             logging.error(f"- Error: {error.message}")
             logging.error(f"- Line: {error.line}, Column: {error.column}")
 
-        return False, schema.error_log
+        return False, error_log
 
 
 def check_rule(checker_data: models.CheckerData) -> None:
@@ -71,9 +68,7 @@ def check_rule(checker_data: models.CheckerData) -> None:
     logging.info("Executing valid_schema check")
 
     schema_version = checker_data.schema_version
-    xsd_file = schema_files.SCHEMA_FILES.get(schema_version)
-
-    if xsd_file is None:
+    if schema_version not in schema_files.SCHEMA_FILES:
         checker_data.result.set_checker_status(
             checker_bundle_name=constants.BUNDLE_NAME,
             checker_id=CHECKER_ID,
@@ -88,11 +83,12 @@ def check_rule(checker_data: models.CheckerData) -> None:
 
         return
 
-    xsd_file_path = str(
-        importlib.resources.files("qc_openscenario.schema").joinpath(xsd_file)
-    )
+    if checker_data.validated_schema_version == schema_version:
+        logging.info("- XML was validated while parsing. XML is valid.")
+        return
+
     schema_compliant, errors = _is_schema_compliant(
-        checker_data.input_file_xml_root, xsd_file_path
+        checker_data.input_file_xml_root, schema_version
     )
 
     if not schema_compliant:
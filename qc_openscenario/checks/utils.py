@@ -6,10 +6,15 @@
 
 from lxml import etree
 from io import BytesIO
-from typing import Union, Optional
-from qc_openscenario.checks import models
+from typing import FrozenSet, Union, Optional
+from qc_baselib import Configuration
+
+from qc_openscenario import constants
+from qc_openscenario.checks import models, road_network_cache
+from qc_openscenario.schema import schema_registry
 import re
 import logging
+import copy
 import os
 
 EXPRESSION_PATTERN = re.compile(r"[$][{][ A-Za-z0-9_\+\-\*/%$\(\)\.,]*[\}]")
@@ -23,17 +28,263 @@ def to_float(s):
         return None
 
 
+def strip_default_namespace(tree: etree._ElementTree) -> etree._ElementTree:
+    """Remove the default namespace from the tags of a parsed tree, in place
+
+    Only elements without prefix are renamed, so prefixed namespaces (e.g. xsi)
+    and attribute values are left untouched. Source line numbers are preserved.
+
+    Args:
+        tree (etree._ElementTree): the parsed tree
+
+    Returns:
+        etree._ElementTree: the same tree, without default namespace
+    """
+    is_stripped = False
+    # Elements are visited lazily, one proxy at a time, instead of collecting
+    # a proxy for every element of the document upfront
+    for element in tree.iter(etree.Element):
+        if element.prefix is None and element.tag[0] == "{":
+            element.tag = etree.QName(element).localname
+            is_stripped = True
+
+    if is_stripped:
+        etree.cleanup_namespaces(tree)
+
+    return tree
+
+
+def parse_xml_without_default_namespace(xml_content: bytes) -> etree._ElementTree:
+    """Parse raw xml content into a tree without its default namespace
+
+    Args:
+        xml_content (bytes): raw content of the xml document
+
+    Raises:
+        etree.XMLSyntaxError: if the content is not a well-formed xml document
+
+    Returns:
+        etree._ElementTree: the parsed tree
+    """
+    return strip_default_namespace(etree.parse(BytesIO(xml_content)))
+
+
 def get_root_without_default_namespace(path: str) -> Optional[etree._ElementTree]:
     if not os.path.exists(path):
         return None
 
-    with open(path, "rb") as raw_file:
-        xml_string = raw_file.read().decode()
+    return strip_default_namespace(etree.parse(path))
 
-        if "xmlns" in xml_string:
-            xml_string = re.sub(' xmlns="[^"]+"', "", xml_string)
 
-        return etree.parse(BytesIO(xml_string.encode()))
+def ingest_xml_file(
+    path: str,
+) -> tuple[Optional[etree._ElementTree], Optional[etree.XMLSyntaxError]]:
+    """Read and parse the input file exactly once
+
+    Args:
+        path (str): path of the xml file to ingest
+
+    Returns:
+        tuple[Optional[etree._ElementTree], Optional[etree.XMLSyntaxError]]:
+            the parsed tree without default namespace and None if the file is a valid xml document.
+            None and the syntax error if the file cannot be parsed.
+            None and None if the file does not exist.
+    """
+    try:
+        return get_root_without_default_namespace(path), None
+    except etree.XMLSyntaxError as e:
+        return None, e
+
+
+HEADER_READ_CHUNK_SIZE = 4096
+# Chunks read once the FileHeader is found, only to check well-formedness
+BODY_READ_CHUNK_SIZE = 1 << 20
+
+
+def _copy_header_tree(
+    root: etree._Element, file_header: etree._Element
+) -> etree._ElementTree:
+    header_root = etree.Element(root.tag, attrib=root.attrib, nsmap=root.nsmap)
+    header_root.append(copy.deepcopy(file_header))
+    return strip_default_namespace(header_root.getroottree())
+
+
+def _close_pull_parser(parser: etree.XMLPullParser) -> None:
+    try:
+        parser.close()
+    except etree.XMLSyntaxError as e:
+        # The pull parser reports errors at the very start of the input, e.g.
+        # in an empty file, at row 0 and column -1, while a regular parse
+        # reports them at row 1 and column 0
+        if e.lineno < 1:
+            e.lineno, e.offset = 1, 0
+        raise
+
+
+def ingest_xml_file_header(
+    path: str,
+) -> tuple[Optional[etree._ElementTree], Optional[etree.XMLSyntaxError]]:
+    """Parse the input file incrementally, keeping only its FileHeader.
+    The file is read in small chunks until the FileHeader child of the root
+    is parsed. The rest of the file is then only checked to be well-formed,
+    each element being dropped as soon as it ends, so that memory stays
+    constant whatever the size of the file and truncated files are detected.
+
+    Args:
+        path (str): path of the xml file to ingest
+
+    Returns:
+        tuple[Optional[etree._ElementTree], Optional[etree.XMLSyntaxError]]:
+            the partial tree without default namespace, made of the root and
+            the FileHeader if any, and None if the file is a valid xml document.
+            None and the syntax error if the file cannot be parsed.
+            None and None if the file does not exist.
+    """
+    if not os.path.exists(path):
+        return None, None
+
+    parser = etree.XMLPullParser(events=("start", "end"))
+    root = None
+    header_tree = None
+    chunk_size = HEADER_READ_CHUNK_SIZE
+
+    try:
+        with open(path, "rb") as xml_file:
+            while True:
+                chunk = xml_file.read(chunk_size)
+                if not chunk:
+                    _close_pull_parser(parser)
+                    break
+
+                parser.feed(chunk)
+
+                for event, element in parser.read_events():
+                    if root is None:
+                        root = element
+                        continue
+
+                    if event != "end" or element is root:
+                        continue
+
+                    if header_tree is None:
+                        # Descendants are kept until their child of the root
+                        # ends, so that the FileHeader is complete
+                        if element.getparent() is not root:
+                            continue
+
+                        if etree.QName(element).localname == "FileHeader":
+                            header_tree = _copy_header_tree(root, element)
+                            chunk_size = BODY_READ_CHUNK_SIZE
+
+                    element.clear()
+                    # Also drop the already processed siblings
+                    while element.getprevious() is not None:
+                        del element.getparent()[0]
+    except etree.XMLSyntaxError as e:
+        return None, e
+
+    if header_tree is None:
+        # No FileHeader in the file
+        header_tree = strip_default_namespace(root.getroottree())
+
+    return header_tree, None
+
+
+def ingest_xml_content(
+    xml_content: bytes,
+) -> tuple[Optional[etree._ElementTree], Optional[etree.XMLSyntaxError]]:
+    """Parse raw xml content received in memory
+
+    Args:
+        xml_content (bytes): raw content of the xml document
+
+    Returns:
+        tuple[Optional[etree._ElementTree], Optional[etree.XMLSyntaxError]]:
+            the parsed tree without default namespace and None if the content is a valid xml document.
+            None and the syntax error if the content cannot be parsed.
+    """
+    try:
+        return parse_xml_without_default_namespace(xml_content), None
+    except etree.XMLSyntaxError as e:
+        return None, e
+
+
+def read_header_schema_version(path: str) -> Optional[str]:
+    """Read the standard schema version from the FileHeader of a xml file
+    without parsing the whole document. Parsing stops right after the
+    FileHeader start tag, hence only the first few KB of the file are read.
+
+    Args:
+        path (str): path of the xml file
+
+    Returns:
+        Optional[str]: the version as "revMajor.revMinor.0".
+            None if the file cannot be read or the FileHeader is not the first child of the root
+    """
+    try:
+        # The file is closed here, as the abandoned iterparse would not
+        with open(path, "rb") as xml_file:
+            events = etree.iterparse(xml_file, events=("start",))
+            # First start event is the root, the second one is its first child
+            next(events)
+            _, file_header = next(events)
+    except (OSError, StopIteration, etree.XMLSyntaxError):
+        return None
+
+    if etree.QName(file_header).localname != "FileHeader":
+        return None
+
+    rev_major = file_header.get("revMajor")
+    rev_minor = file_header.get("revMinor")
+    if rev_major is None or rev_minor is None:
+        return None
+
+    return f"{rev_major}.{rev_minor}.0"
+
+
+def ingest_and_validate_xml_file(
+    path: str,
+) -> tuple[Optional[etree._ElementTree], Optional[str]]:
+    """Parse the input file and validate it against its schema in a single pass.
+    The schema is selected from the version found in the FileHeader.
+
+    Args:
+        path (str): path of the xml file to ingest
+
+    Returns:
+        tuple[Optional[etree._ElementTree], Optional[str]]:
+            the parsed tree without default namespace and the schema version it is valid against.
+            None and None if the schema cannot be selected, or the file is not
+            well-formed or not valid. The file then needs to go through the regular ingestion.
+    """
+    schema_version = read_header_schema_version(path)
+    schema = schema_registry.get_schema(schema_version)
+    if schema is None:
+        return None, None
+
+    try:
+        tree = etree.parse(path, etree.XMLParser(schema=schema))
+    except (OSError, etree.XMLSyntaxError) as e:
+        logging.debug(f"Validation while parsing failed: {e}")
+        return None, None
+
+    return strip_default_namespace(tree), schema_version
+
+
+def is_bundle_param_enabled(config: Configuration, param_name: str) -> bool:
+    """Check if a boolean checker bundle parameter is set to true in the configuration
+
+    Args:
+        config (Configuration): the checker configuration
+        param_name (str): the name of the checker bundle parameter
+
+    Returns:
+        bool: True if the parameter value is "true" or "1". False otherwise
+    """
+    value = config.get_checker_bundle_param(
+        checker_bundle_name=constants.BUNDLE_NAME, param_name=param_name
+    )
+    return str(value).lower() in ("true", "1")
 
 
 def get_standard_schema_version(root: etree._ElementTree) -> Optional[str]:
@@ -45,6 +296,117 @@ def get_standard_schema_version(root: etree._ElementTree) -> Optional[str]:
     return version
 
 
+INDEX_ANCHORS = {
+    "Entities": "entities",
+    "Storyboard": "storyboard",
+    "RoadNetwork": "road_network",
+    "ParameterDeclarations": "parameter_declarations",
+    "VariableDeclarations": "variable_declarations",
+}
+
+# Lookups of the checkers within a section, the only ones indexed in the
+# sections, so that the elements of a section are not indexed twice
+SECTION_TAGS = {
+    "RoadNetwork": frozenset({"TrafficSignalController"}),
+}
+SECTION_ATTRIBUTES = {
+    "Storyboard": frozenset({"entityRef", "variableRef", "storyboardElementRef"}),
+}
+
+
+def _add_to_index(index: models.DocumentIndex, element: etree._Element) -> None:
+    index.elements_by_tag.setdefault(element.tag, []).append(element)
+
+    for attribute_name in element.keys():
+        index.elements_by_attribute.setdefault(attribute_name, []).append(element)
+
+    name = element.get("name")
+    if name is not None:
+        index.elements_by_name.setdefault(name, []).append(element)
+
+
+def _add_to_section(
+    section_index: models.DocumentIndex,
+    element: etree._Element,
+    tags: FrozenSet[str],
+    attribute_names: FrozenSet[str],
+) -> None:
+    if element.tag in tags:
+        section_index.elements_by_tag.setdefault(element.tag, []).append(element)
+
+    for attribute_name in attribute_names:
+        if attribute_name in element.attrib:
+            section_index.elements_by_attribute.setdefault(attribute_name, []).append(
+                element
+            )
+
+
+def build_document_index(tree: etree._ElementTree) -> models.DocumentIndex:
+    """Index all the elements below the root of the tree in a single traversal.
+    Sections only index the lookups in SECTION_TAGS and SECTION_ATTRIBUTES
+
+    Args:
+        tree (etree._ElementTree): the tree to index
+
+    Returns:
+        models.DocumentIndex: the index of the tree
+    """
+    index = models.DocumentIndex()
+
+    for top_level_element in tree.getroot().iterchildren(etree.Element):
+        anchor = INDEX_ANCHORS.get(top_level_element.tag)
+        section_index = None
+        # Same as root.find(), only the first occurrence of an anchor is used
+        if anchor is not None and getattr(index, anchor) is None:
+            setattr(index, anchor, top_level_element)
+            section_index = models.DocumentIndex()
+            index.sections[top_level_element.tag] = section_index
+        section_tags = SECTION_TAGS.get(top_level_element.tag, frozenset())
+        section_attributes = SECTION_ATTRIBUTES.get(top_level_element.tag, frozenset())
+
+        for element in top_level_element.iter(etree.Element):
+            _add_to_index(index, element)
+            if section_index is not None and element is not top_level_element:
+                _add_to_section(
+                    section_index, element, section_tags, section_attributes
+                )
+
+    return index
+
+
+def build_parameter_scope_table(
+    index: models.DocumentIndex,
+) -> models.ParameterScopeTable:
+    """Build the lexical scopes of all ParameterDeclarations of an indexed document
+
+    Args:
+        index (models.DocumentIndex): index of the document
+
+    Returns:
+        models.ParameterScopeTable: the scope table of the document
+    """
+    declarations_by_element = {}
+    for declarations_node in index.get_elements_by_tag("ParameterDeclarations"):
+        declarations = declarations_by_element.setdefault(
+            declarations_node.getparent(), {}
+        )
+        for declaration in declarations_node.iterchildren("ParameterDeclaration"):
+            # The first declaration of a name wins, as in get_parameter_value_from_node
+            declarations.setdefault(declaration.get("name"), declaration.get("value"))
+
+    # Enclosing scopes must exist before the scopes they contain
+    scope_elements = sorted(
+        declarations_by_element,
+        key=lambda element: sum(1 for _ in element.iterancestors()),
+    )
+
+    table = models.ParameterScopeTable()
+    for element in scope_elements:
+        table.add_scope(element, declarations_by_element[element])
+
+    return table
+
+
 def compare_versions(version1: str, version2: str) -> int:
     """Compare two version strings like "X.x.x"
         This function is to avoid comparing version string basing on lexicographical order
@@ -78,7 +440,10 @@ def compare_versions(version1: str, version2: str) -> int:
 
 
 def get_parameter_value_from_node(
-    tree: etree._ElementTree, node: etree._Element, parameter_name: str
+    tree: etree._ElementTree,
+    node: etree._Element,
+    parameter_name: str,
+    parameter_scopes: Optional[models.ParameterScopeTable] = None,
 ) -> Union[None, str, int, float]:
     """Read all ParameterDeclaration visible from node and get the value of parameter_name if present
 
@@ -86,10 +451,15 @@ def get_parameter_value_from_node(
         root (etree._ElementTree): root node of the xml document
         node (etree._Element): node to start the upward search from
         parameter_name (str): the parameter name to search
+        parameter_scopes (Optional[models.ParameterScopeTable]): precomputed scopes of the document.
+            If given, they are used instead of searching the declarations of every ancestor
 
     Returns:
         Union[None, str, int, float]: the parameter value is present, with its type. None if the parameter_name is not found
     """
+    if parameter_scopes is not None:
+        return parameter_scopes.get_parameter_value(node, parameter_name)
+
     # Dictionary to hold parameters
     params_dict = {}
     parameter_xpath = "./ParameterDeclarations/ParameterDeclaration"
@@ -111,19 +481,20 @@ def get_parameter_value_from_node(
         return None
 
 
-def get_xodr_road_network(
-    input_file_path: str, tree: etree._ElementTree
-) -> Optional[etree._ElementTree]:
-    """Get parsed xodr tree indicated in the RoadNetwork/LogicFile node of the input tree
+def get_xodr_file_path(
+    tree: etree._ElementTree,
+    parameter_scopes: Optional[models.ParameterScopeTable] = None,
+) -> Optional[str]:
+    """Get the xodr file path indicated in the RoadNetwork/LogicFile node of the input tree
 
     Args:
         tree (etree._ElementTree): xml document tree that refers to a xodr file
+        parameter_scopes (Optional[models.ParameterScopeTable]): precomputed scopes of the document
 
     Returns:
-        Optional[etree._ElementTree]: the parsed road network tree.
-                                      None if the specified nodes in the root or the road network file are not found
+        Optional[str]: the file path as written in the document, with parameters resolved.
+                       None if the specified nodes or parameter are not found
     """
-
     road_network = tree.find("RoadNetwork")
     if road_network is None:
         return None
@@ -137,18 +508,140 @@ def get_xodr_road_network(
     # If filepath is specified using param, get all param declaration and update the filepath
     if get_attribute_type(filepath) == models.AttributeType.PARAMETER:
         filepath_param = filepath[1:]
-        filepath = get_parameter_value_from_node(tree, tree.getroot(), filepath_param)
-        if filepath is None:
-            return None
+        filepath = get_parameter_value_from_node(
+            tree, tree.getroot(), filepath_param, parameter_scopes
+        )
+
+    return filepath
+
+
+def _collect_road_network_facts(
+    source: Union[str, BytesIO],
+) -> models.RoadNetworkFacts:
+    ids = {"signal": set(), "controller": set(), "junction": set()}
+    # Controllers and junctions are defined under the root. Junctions also
+    # contain controller elements, which only refer to a controller by id
+    root_level_tags = {"controller", "junction"}
+
+    for _, element in etree.iterparse(source, events=("end",)):
+        # Drop the default namespace, if any
+        tag = element.tag.rpartition("}")[2]
+        parent = element.getparent()
+        if tag in ids and (
+            tag not in root_level_tags
+            or (parent is not None and parent.getparent() is None)
+        ):
+            element_id = element.get("id")
+            if element_id is not None:
+                ids[tag].add(element_id)
+
+        element.clear()
+        # Also drop the already processed siblings
+        while element.getprevious() is not None:
+            del element.getparent()[0]
+
+    return models.RoadNetworkFacts(
+        signal_ids=frozenset(ids["signal"]),
+        controller_ids=frozenset(ids["controller"]),
+        junction_ids=frozenset(ids["junction"]),
+    )
+
+
+def extract_road_network_facts(path: str) -> Optional[models.RoadNetworkFacts]:
+    """Stream a xodr file and keep only the facts needed by the checkers.
+    Elements are cleared as soon as they are processed, so the whole
+    document is never held in memory.
+
+    Args:
+        path (str): path of the xodr file
+
+    Returns:
+        Optional[models.RoadNetworkFacts]: the road network facts. None if the file does not exist
+    """
+    if not os.path.exists(path):
+        return None
+
+    return _collect_road_network_facts(path)
+
+
+def extract_road_network_facts_from_content(
+    xodr_content: bytes,
+) -> models.RoadNetworkFacts:
+    """Extract the facts needed by the checkers from raw xodr content
+
+    Args:
+        xodr_content (bytes): raw content of the xodr document
+
+    Raises:
+        etree.XMLSyntaxError: if the content is not a well-formed xml document
+
+    Returns:
+        models.RoadNetworkFacts: the road network facts
+    """
+    return _collect_road_network_facts(BytesIO(xodr_content))
 
-    previous_wd = os.getcwd()
-    os.chdir(os.path.dirname(input_file_path))
 
-    xodr_root = get_root_without_default_namespace(filepath)
+def get_cached_road_network_facts(
+    path: str,
+    cache_dir: Optional[str] = None,
+    cache_max_size: int = road_network_cache.DISK_CACHE_DEFAULT_MAX_SIZE,
+) -> Optional[models.RoadNetworkFacts]:
+    """Get the facts of a xodr file, extracting them only if they are not cached yet
+
+    Args:
+        path (str): path of the xodr file
+        cache_dir (Optional[str]): directory of the persistent cache. Only the
+            in-memory cache is used if not specified
+        cache_max_size (int): maximum size in bytes of the persistent cache
+
+    Returns:
+        Optional[models.RoadNetworkFacts]: the road network facts. None if the file does not exist
+    """
+    cache_key = road_network_cache.get_cache_key(path)
+    if cache_key is None:
+        return None
+
+    road_network_facts = road_network_cache.load(cache_key, cache_dir)
+    if road_network_facts is None:
+        road_network_facts = extract_road_network_facts(path)
+        if road_network_facts is not None:
+            road_network_cache.store(
+                cache_key, road_network_facts, cache_dir, cache_max_size
+            )
+
+    return road_network_facts
+
+
+def get_road_network_facts(
+    input_file_path: str,
+    tree: etree._ElementTree,
+    parameter_scopes: Optional[models.ParameterScopeTable] = None,
+    cache_dir: Optional[str] = None,
+    cache_max_size: int = road_network_cache.DISK_CACHE_DEFAULT_MAX_SIZE,
+) -> Optional[models.RoadNetworkFacts]:
+    """Get the facts of the xodr file indicated in the RoadNetwork/LogicFile node of the input tree
+
+    Args:
+        input_file_path (str): path of the input file, the xodr file path is relative to it
+        tree (etree._ElementTree): xml document tree that refers to a xodr file
+        parameter_scopes (Optional[models.ParameterScopeTable]): precomputed scopes of the document
+        cache_dir (Optional[str]): directory of the persistent road network facts cache
+        cache_max_size (int): maximum size in bytes of the persistent cache
+
+    Returns:
+        Optional[models.RoadNetworkFacts]: the road network facts.
+                                           None if the specified nodes in the root or the road network file are not found
+    """
+    filepath = get_xodr_file_path(tree, parameter_scopes)
+    if filepath is None:
+        return None
 
-    os.chdir(previous_wd)
+    # Relative paths are resolved against the directory of the input file.
+    # The working directory is left untouched, so that several files can be
+    # checked concurrently within the same process
+    filepath = os.path.join(os.path.dirname(input_file_path), filepath)
 
-    return xodr_root
+    return get_cached_road_network_facts(filepath, cache_dir, cache_max_size)
 
 
 def get_attribute_type(attribute_value: str) -> models.AttributeType:
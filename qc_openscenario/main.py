@@ -5,20 +5,26 @@
 # with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
 
 import argparse
+import dataclasses
 import logging
+import os
+import time
 from datetime import datetime
-import types
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import ExitStack, contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
 from qc_baselib import Configuration, Result, StatusType
 from qc_baselib.models.common import ParamType
 
-from qc_openscenario import constants
+from qc_openscenario import batch, constants, profiling, server, tracing
+from qc_openscenario import worker_pool
 from qc_openscenario.checks import schema_checker
-from qc_openscenario.checks import basic_checker
-from qc_openscenario.checks import reference_checker
-from qc_openscenario.checks import parameters_checker
-from qc_openscenario.checks import data_type_checker
-from qc_openscenario.checks import utils, models
+from qc_openscenario.checks import utils, models, registry, result_recorder
+from qc_openscenario.checks import checker_metrics, road_network_cache
+from qc_openscenario.schema import schema_registry
+from qc_openscenario.schema.schema_files import SCHEMA_FILES
 
 logging.basicConfig(format="%(asctime)s - %(message)s", level=logging.INFO)
 
@@ -29,201 +35,704 @@ def args_entrypoint() -> argparse.Namespace:
         description="This is a collection of scripts for checking validity of OpenScenario (.xosc) files.",
     )
 
-    group = parser.add_mutually_exclusive_group(required=True)
+    group = parser.add_mutually_exclusive_group()
     group.add_argument("-d", "--default_config", action="store_true")
     group.add_argument("-c", "--config_path")
 
     parser.add_argument("-g", "--generate_markdown", action="store_true")
 
-    return parser.parse_args()
+    parser.add_argument(
+        "-b",
+        "--batch",
+        help="Directory or text file listing the .xosc files to check in a single run. "
+        "The input file of the configuration is ignored.",
+    )
+    parser.add_argument(
+        "-o",
+        "--output_dir",
+        default=".",
+        help="Directory of the result files in batch mode.",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of worker processes in batch mode. 0 uses one worker per CPU.",
+    )
+    parser.add_argument(
+        "--cost_file",
+        help="JSON file with the check duration of each file, used in batch mode "
+        "to check the most expensive files first. It is updated after each run.",
+    )
 
+    parser.add_argument(
+        "--trace",
+        help="Chrome trace event file to write with the duration of each phase "
+        "of the checks, with a track per worker process. It can be opened "
+        "offline in Perfetto or chrome://tracing.",
+    )
+    parser.add_argument(
+        "--profile",
+        help="Directory to write a cProfile .pstats file for each phase of the "
+        "checks and a summary of the functions taking the most time.",
+    )
 
-def execute_checker(
-    checker: types.ModuleType,
-    checker_data: models.CheckerData,
-    required_definition_setting: bool = True,
+    subparsers = parser.add_subparsers(dest="command")
+    serve_parser = subparsers.add_parser(
+        "serve",
+        help="Run a server checking the files received over HTTP, on a local "
+        "TCP port or a Unix socket.",
+    )
+    # Suppressed defaults keep the options given before the command
+    serve_parser.add_argument("-c", "--config_path", default=argparse.SUPPRESS)
+    serve_parser.add_argument("--host", default=server.DEFAULT_HOST)
+    serve_parser.add_argument("--port", type=int, default=server.DEFAULT_PORT)
+    serve_parser.add_argument(
+        "--unix_socket", help="Path of a Unix socket to listen on instead of a port."
+    )
+    serve_parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of worker processes. 0 uses one worker per CPU.",
+    )
+    serve_parser.add_argument(
+        "--queue_size",
+        type=int,
+        default=server.DEFAULT_QUEUE_SIZE,
+        help="Number of files waiting for a worker above which requests are rejected.",
+    )
+
+    args = parser.parse_args()
+
+    if (
+        args.command is None
+        and args.batch is None
+        and not args.default_config
+        and args.config_path is None
+    ):
+        parser.error(
+            "one of the arguments -d/--default_config -c/--config_path is required"
+        )
+
+    if args.profile is not None and (
+        args.command is not None or (args.batch is not None and args.jobs != 1)
+    ):
+        parser.error("--profile is only supported by in-process checks, with --jobs 1")
+
+    if args.trace is not None and args.command is not None:
+        parser.error("--trace is not supported by the server")
+
+    return args
+
+
+@contextmanager
+def _phase(name: str, category: str = "phase") -> Iterator[None]:
+    # Traced and profiled part of the checks, see --trace and --profile
+    with tracing.trace_span(name, category), profiling.profile_phase(name):
+        yield
+
+
+def _skip_checker(
+    checker: registry.CheckerSpec, checker_data: models.CheckerData, summary: str
+) -> None:
+    checker_data.result.set_checker_status(
+        checker_bundle_name=constants.BUNDLE_NAME,
+        checker_id=checker.checker_id,
+        status=StatusType.SKIPPED,
+    )
+
+    checker_data.result.add_checker_summary(
+        constants.BUNDLE_NAME, checker.checker_id, summary
+    )
+
+
+def _register_checker(
+    checker: registry.CheckerSpec, checker_data: models.CheckerData
 ) -> None:
     # Register checker
     checker_data.result.register_checker(
         checker_bundle_name=constants.BUNDLE_NAME,
-        checker_id=checker.CHECKER_ID,
-        description=checker.CHECKER_DESCRIPTION,
+        checker_id=checker.checker_id,
+        description=checker.description,
     )
 
     # Register rule uid
     checker_data.result.register_rule_by_uid(
         checker_bundle_name=constants.BUNDLE_NAME,
-        checker_id=checker.CHECKER_ID,
-        rule_uid=checker.RULE_UID,
+        checker_id=checker.checker_id,
+        rule_uid=checker.rule_uid,
     )
 
-    # Check preconditions. If not satisfied then set status as SKIPPED and return
-    if not checker_data.result.all_checkers_completed_without_issue(
-        checker.CHECKER_PRECONDITIONS
-    ):
-        checker_data.result.set_checker_status(
-            checker_bundle_name=constants.BUNDLE_NAME,
-            checker_id=checker.CHECKER_ID,
-            status=StatusType.SKIPPED,
-        )
 
-        checker_data.result.add_checker_summary(
-            constants.BUNDLE_NAME,
-            checker.CHECKER_ID,
-            "Preconditions are not satisfied. Skip the check.",
-        )
+def execute_checker(
+    checker: registry.CheckerSpec,
+    checker_data: models.CheckerData,
+    passed_checker_ids: Set[str],
+) -> None:
+    """Run a checker and record its outcome
+
+    Args:
+        checker (registry.CheckerSpec): the checker to run
+        checker_data (models.CheckerData): the ingested document
+        passed_checker_ids (Set[str]): checkers completed without issue so
+            far. The checker is added to it if it completes without issue
+    """
+    _register_checker(checker, checker_data)
 
+    # Check preconditions. If not satisfied then set status as SKIPPED and return
+    if not checker.preconditions <= passed_checker_ids:
+        _skip_checker(
+            checker, checker_data, "Preconditions are not satisfied. Skip the check."
+        )
         return
 
     # Checker definition setting. If not satisfied then set status as SKIPPED and return
-    if required_definition_setting:
-        schema_version = checker_data.schema_version
-
-        splitted_rule_uid = checker.RULE_UID.split(":")
-        if len(splitted_rule_uid) != 4:
-            raise RuntimeError(f"Invalid rule uid: {checker.RULE_UID}")
-
-        definition_setting = splitted_rule_uid[2]
-        if (
-            schema_version is None
-            or utils.compare_versions(schema_version, definition_setting) < 0
-        ):
-            checker_data.result.set_checker_status(
-                checker_bundle_name=constants.BUNDLE_NAME,
-                checker_id=checker.CHECKER_ID,
-                status=StatusType.SKIPPED,
-            )
-
-            checker_data.result.add_checker_summary(
-                constants.BUNDLE_NAME,
-                checker.CHECKER_ID,
-                f"Version {schema_version} is lower than definition setting {definition_setting}. Skip the check.",
-            )
+    schema_version = checker_data.schema_version
+    if checker.checker_id not in registry.CHECKER_REGISTRY.get_enabled_checker_ids(
+        schema_version
+    ):
+        _skip_checker(
+            checker,
+            checker_data,
+            f"Version {schema_version} is lower than definition setting {checker.definition_setting}. Skip the check.",
+        )
+        return
 
-            return
+    measurement = None
+    if checker_data.checker_metrics is not None:
+        measurement = checker_metrics.CheckerMeasurement()
 
     # Execute checker
     try:
-        checker.check_rule(checker_data)
+        with _phase(f"checker.{checker.checker_id}", "checker"):
+            checker.module.check_rule(checker_data)
 
         # If checker is not explicitly set as SKIPPED, then set it as COMPLETED
         if (
-            checker_data.result.get_checker_status(checker.CHECKER_ID)
+            checker_data.result.get_checker_status(checker.checker_id)
             != StatusType.SKIPPED
         ):
             checker_data.result.set_checker_status(
                 checker_bundle_name=constants.BUNDLE_NAME,
-                checker_id=checker.CHECKER_ID,
+                checker_id=checker.checker_id,
                 status=StatusType.COMPLETED,
             )
     except Exception as e:
         # If any exception occurs during the check, set the status as ERROR
         checker_data.result.set_checker_status(
             checker_bundle_name=constants.BUNDLE_NAME,
-            checker_id=checker.CHECKER_ID,
+            checker_id=checker.checker_id,
             status=StatusType.ERROR,
         )
 
         checker_data.result.add_checker_summary(
-            constants.BUNDLE_NAME, checker.CHECKER_ID, f"Error: {str(e)}."
+            constants.BUNDLE_NAME, checker.checker_id, f"Error: {str(e)}."
+        )
+
+        message = f"An error occurred in {checker.checker_id}."
+        if isinstance(checker_data.result, result_recorder.ResultRecorder):
+            # Logged on replay, as the run may be discarded
+            checker_data.result.log_exception(message)
+        else:
+            logging.exception(message)
+        return
+    finally:
+        if measurement is not None:
+            checker_data.checker_metrics[checker.checker_id] = measurement.stop(
+                checker_data.result.get_checker_issue_count(
+                    checker_bundle_name=constants.BUNDLE_NAME,
+                    checker_id=checker.checker_id,
+                )
+            )
+
+    if (
+        checker_data.result.get_checker_status(checker.checker_id)
+        == StatusType.COMPLETED
+        and checker_data.result.get_checker_issue_count(
+            checker_bundle_name=constants.BUNDLE_NAME, checker_id=checker.checker_id
+        )
+        == 0
+    ):
+        passed_checker_ids.add(checker.checker_id)
+
+
+def _skip_document_checkers(
+    checker_data: models.CheckerData, checkers: List[registry.CheckerSpec]
+) -> None:
+    schema_version = checker_data.schema_version
+
+    for checker in checkers:
+        if (
+            checker.module is schema_checker.valid_schema
+            and schema_version is not None
+            and schema_version not in SCHEMA_FILES
+        ):
+            summary = f"- Schema file for version {schema_version} does not exist. Skip the check."
+        else:
+            summary = "Triage only: the file is not parsed beyond its FileHeader. Skip the check."
+
+        _register_checker(checker, checker_data)
+        _skip_checker(checker, checker_data, summary)
+
+
+def _execute_checker_speculatively(
+    checker: registry.CheckerSpec,
+    checker_data: models.CheckerData,
+    passed_checker_ids: Set[str],
+) -> List[Dict]:
+    # The spans are added to the trace on replay, as the run may be discarded
+    with tracing.capture_events() as events:
+        execute_checker(checker, checker_data, passed_checker_ids)
+    return events
+
+
+def _execute_checkers_concurrently(
+    checkers: List[registry.CheckerSpec],
+    checker_data: models.CheckerData,
+    passed_checker_ids: Set[str],
+    threads: int,
+) -> None:
+    """Run checkers in a pool of threads sharing the read-only document.
+    A checker does not wait for the checkers it depends on, it runs
+    speculatively as if they passed. Each checker writes to its own
+    ResultRecorder, and the recordings are replayed on the result in the
+    topological order. A recording is discarded if a precondition eventually
+    failed and the checker is skipped instead, so that the result is the same
+    as when the checkers run one after another, along with its log and trace
+    spans.
+    """
+    pending_checker_ids = {x.checker_id for x in checkers}
+    runs = []
+
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        for checker in checkers:
+            if not checker.preconditions <= passed_checker_ids | pending_checker_ids:
+                # A precondition already failed, the checker is skipped below
+                runs.append((checker, None, None, None))
+                continue
+
+            recorder = result_recorder.ResultRecorder()
+            speculative_passed_checker_ids = passed_checker_ids | checker.preconditions
+            future = executor.submit(
+                _execute_checker_speculatively,
+                checker,
+                dataclasses.replace(checker_data, result=recorder),
+                speculative_passed_checker_ids,
+            )
+            runs.append((checker, recorder, speculative_passed_checker_ids, future))
+
+        for checker, recorder, speculative_passed_checker_ids, future in runs:
+            events = future.result() if future is not None else None
+
+            if future is None or not checker.preconditions <= passed_checker_ids:
+                if checker_data.checker_metrics is not None:
+                    checker_data.checker_metrics.pop(checker.checker_id, None)
+                execute_checker(checker, checker_data, passed_checker_ids)
+                continue
+
+            recorder.replay(checker_data.result)
+            tracing.add_events(events)
+            if checker.checker_id in speculative_passed_checker_ids:
+                passed_checker_ids.add(checker.checker_id)
+
+
+def _get_checker_threads(config: Configuration) -> int:
+    checker_threads = config.get_checker_bundle_param(
+        checker_bundle_name=constants.BUNDLE_NAME, param_name="checkerThreads"
+    )
+    if checker_threads is None:
+        return 1
+
+    checker_threads = int(checker_threads)
+    if checker_threads == 0:
+        return os.cpu_count() or 1
+
+    return checker_threads
+
+
+def _get_road_network_cache_settings(
+    config: Configuration,
+) -> tuple[Optional[str], int]:
+    cache_dir = config.get_checker_bundle_param(
+        checker_bundle_name=constants.BUNDLE_NAME, param_name="roadNetworkCacheDir"
+    )
+    cache_max_size = config.get_checker_bundle_param(
+        checker_bundle_name=constants.BUNDLE_NAME, param_name="roadNetworkCacheMaxSize"
+    )
+    if cache_max_size is None:
+        cache_max_size = road_network_cache.DISK_CACHE_DEFAULT_MAX_SIZE
+
+    return cache_dir, int(cache_max_size)
+
+
+def _ingest_input_file(checker_data: models.CheckerData) -> None:
+    config = checker_data.config
+    triage_only = utils.is_bundle_param_enabled(config, "triageOnly")
+
+    # 0. Ingest the input file. It is read and parsed only once, then the tree
+    # is shared with every checker
+    if triage_only:
+        # Only the beginning of the file up to the FileHeader is parsed, which
+        # is enough for the basic checks
+        checker_data.input_file_xml_root, checker_data.xml_syntax_error = (
+            utils.ingest_xml_file_header(checker_data.xml_file_path)
+        )
+    elif utils.is_bundle_param_enabled(config, "validateWhileParsing"):
+        # Files that are not valid fall back to the regular ingestion, so that
+        # valid_schema can report the errors with their location
+        checker_data.input_file_xml_root, checker_data.validated_schema_version = (
+            utils.ingest_and_validate_xml_file(checker_data.xml_file_path)
         )
 
-        logging.exception(f"An error occurred in {checker.CHECKER_ID}.")
+    if checker_data.input_file_xml_root is None and not triage_only:
+        checker_data.input_file_xml_root, checker_data.xml_syntax_error = (
+            utils.ingest_xml_file(checker_data.xml_file_path)
+        )
 
 
-def run_checks(config: Configuration, result: Result) -> None:
+def run_checks(config: Configuration, result: Result) -> models.CheckerData:
     checker_data = models.CheckerData(
         xml_file_path=config.get_config_param("InputFile"),
         input_file_xml_root=None,
         config=config,
         result=result,
         schema_version=None,
-        xodr_root=None,
+        road_network_facts=None,
     )
 
-    # 1. Run basic checks
-    execute_checker(
-        basic_checker.valid_xml_document,
-        checker_data,
-        required_definition_setting=False,
-    )
+    with _phase("ingest"):
+        _ingest_input_file(checker_data)
+
+    check_document(checker_data)
 
-    if result.all_checkers_completed_without_issue(
-        {basic_checker.valid_xml_document.CHECKER_ID}
+    return checker_data
+
+
+def check_document(
+    checker_data: models.CheckerData,
+    checker_ids: Optional[Set[str]] = None,
+) -> None:
+    """Run the checkers on an ingested document, in the topological order of
+    their preconditions, and register their results in checker_data.result
+
+    Args:
+        checker_data (models.CheckerData): the ingested document. Road network
+            facts already set are used instead of the xodr file referenced
+            by the document
+        checker_ids (Optional[Set[str]]): checkers to run, including all their
+            preconditions, see CheckerRegistry.select. All the checkers if not specified
+
+    The cost of each checker is collected in checker_data.checker_metrics and
+    added to the result if the checkerMetrics bundle parameter is enabled.
+    """
+    config = checker_data.config
+    if utils.is_bundle_param_enabled(config, "checkerMetrics"):
+        checker_data.checker_metrics = {}
+
+    with checker_metrics.trace_memory(
+        checker_data.checker_metrics is not None
+        and utils.is_bundle_param_enabled(config, "checkerMetricsMemory")
     ):
-        checker_data.input_file_xml_root = utils.get_root_without_default_namespace(
-            checker_data.xml_file_path
+        _run_checkers(checker_data, checker_ids)
+
+    if checker_data.checker_metrics is not None:
+        checker_metrics.add_metrics_to_result(
+            checker_data.result, checker_data.checker_metrics
         )
 
-    execute_checker(
-        basic_checker.root_tag_is_openscenario,
-        checker_data,
-        required_definition_setting=False,
-    )
-    execute_checker(
-        basic_checker.fileheader_is_present,
-        checker_data,
-        required_definition_setting=False,
-    )
-    execute_checker(
-        basic_checker.version_is_defined,
-        checker_data,
-        required_definition_setting=False,
-    )
 
-    # Get schema version and xodr road network if they exist
-    if result.all_checkers_completed_without_issue(
-        {
-            basic_checker.valid_xml_document.CHECKER_ID,
-            basic_checker.root_tag_is_openscenario.CHECKER_ID,
-            basic_checker.fileheader_is_present.CHECKER_ID,
-            basic_checker.version_is_defined.CHECKER_ID,
-        }
-    ):
+def _run_checkers(
+    checker_data: models.CheckerData, checker_ids: Optional[Set[str]]
+) -> None:
+    config = checker_data.config
+    checker_registry = registry.CHECKER_REGISTRY
+    passed_checker_ids = set()
+
+    def is_selected(checker: registry.CheckerSpec) -> bool:
+        return checker_ids is None or checker.checker_id in checker_ids
+
+    # 1. Run basic checks
+    basic_checkers = [x for x in checker_registry.basic_checkers if is_selected(x)]
+    for checker in basic_checkers:
+        execute_checker(checker, checker_data, passed_checker_ids)
+
+    document_checkers = [
+        x for x in checker_registry.document_checkers if is_selected(x)
+    ]
+
+    # Get schema version and xodr road network facts if they exist
+    if all(x.checker_id in passed_checker_ids for x in checker_registry.basic_checkers):
         checker_data.schema_version = utils.get_standard_schema_version(
             checker_data.input_file_xml_root
         )
-        checker_data.xodr_root = utils.get_xodr_road_network(
-            checker_data.xml_file_path, checker_data.input_file_xml_root
-        )
 
-    # 2. Run schema check
-    execute_checker(schema_checker.valid_schema, checker_data)
+    if utils.is_bundle_param_enabled(config, "triageOnly"):
+        _skip_document_checkers(checker_data, document_checkers)
+        return
 
-    # 3. Run reference checks
-    execute_checker(
-        reference_checker.uniquely_resolvable_entity_references, checker_data
+    # The document index and road network facts are only needed by checkers
+    # that can run for this version
+    enabled_checker_ids = checker_registry.get_enabled_checker_ids(
+        checker_data.schema_version
     )
-    execute_checker(
-        reference_checker.resolvable_signal_id_in_traffic_signal_state_action,
-        checker_data,
-    )
-    execute_checker(
-        reference_checker.resolvable_traffic_signal_controller_by_traffic_signal_controller_ref,
-        checker_data,
+    if checker_data.schema_version is not None and any(
+        x.checker_id in enabled_checker_ids for x in document_checkers
+    ):
+        with _phase("document_index"):
+            checker_data.document_index = utils.build_document_index(
+                checker_data.input_file_xml_root
+            )
+            checker_data.parameter_scopes = utils.build_parameter_scope_table(
+                checker_data.document_index
+            )
+        if checker_data.road_network_facts is None:
+            with _phase("road_network"):
+                checker_data.road_network_facts = utils.get_road_network_facts(
+                    checker_data.xml_file_path,
+                    checker_data.input_file_xml_root,
+                    checker_data.parameter_scopes,
+                    *_get_road_network_cache_settings(config),
+                )
+
+    # 2. Run the schema, reference, parameters and data type checks
+    # Profiled phases must run on the main thread
+    checker_threads = _get_checker_threads(config)
+    if checker_threads > 1 and not profiling.is_profiling():
+        _execute_checkers_concurrently(
+            document_checkers, checker_data, passed_checker_ids, checker_threads
+        )
+    else:
+        for checker in document_checkers:
+            execute_checker(checker, checker_data, passed_checker_ids)
+
+
+def create_result() -> Result:
+    result = Result()
+    result.register_checker_bundle(
+        name=constants.BUNDLE_NAME,
+        description="OpenScenario checker bundle",
+        version=constants.BUNDLE_VERSION,
+        summary="",
     )
-    execute_checker(
-        reference_checker.valid_actor_reference_in_private_actions, checker_data
+    result.set_result_version(version=constants.BUNDLE_VERSION)
+
+    return result
+
+
+def check_file(
+    input_file: str, result_file: str, config_path: Optional[str] = None
+) -> int:
+    """Check a single input file of a batch and write its result file
+
+    Args:
+        input_file (str): path of the file to check
+        result_file (str): path of the result file to write
+        config_path (Optional[str]): configuration used for all the files of the batch
+
+    Returns:
+        int: the number of issues found
+    """
+    config = Configuration()
+    if config_path is not None:
+        config.load_from_file(xml_file_path=config_path)
+    config.set_config_param(name="InputFile", value=input_file)
+    config.register_checker_bundle(checker_bundle_name=constants.BUNDLE_NAME)
+    config.set_checker_bundle_param(
+        checker_bundle_name=constants.BUNDLE_NAME, name="resultFile", value=result_file
     )
-    execute_checker(reference_checker.resolvable_entity_references, checker_data)
-    execute_checker(reference_checker.resolvable_variable_reference, checker_data)
-    execute_checker(
-        reference_checker.resolvable_storyboard_element_reference, checker_data
+
+    with tracing.trace_span("check_file", "file", input_file=input_file) as span:
+        result = create_result()
+
+        checker_data = run_checks(config, result)
+
+        result.copy_param_from_config(config)
+        with _phase("write_result"):
+            result.write_to_file(result_file, generate_summary=True)
+        _write_checker_metrics(checker_data, result_file)
+
+        span["issue_count"] = result.get_issue_count()
+
+    return result.get_issue_count()
+
+
+def _write_checker_metrics(checker_data: models.CheckerData, result_file: str) -> None:
+    if checker_data.checker_metrics is None:
+        return
+
+    checker_metrics.write_metrics_file(
+        checker_metrics.get_metrics_file_path(result_file),
+        checker_data.xml_file_path,
+        checker_data.checker_metrics,
+        [x.checker_id for x in registry.CHECKER_REGISTRY.checkers],
     )
-    execute_checker(reference_checker.unique_element_names_on_same_level, checker_data)
 
-    # 4. Run parameters checks
-    execute_checker(
-        parameters_checker.valid_parameter_declaration_in_catalogs, checker_data
+
+def _check_file_timed(
+    input_file: str,
+    result_file: str,
+    config_path: Optional[str] = None,
+    trace: bool = False,
+) -> Tuple[int, float, List[Dict]]:
+    # Runs in a worker process, which sends its trace events back along with
+    # the result. Forked workers inherit the events of the parent, which are
+    # discarded
+    if trace:
+        tracing.start_tracing()
+
+    start_time = time.perf_counter()
+    issue_count = check_file(input_file, result_file, config_path)
+    duration = time.perf_counter() - start_time
+
+    return issue_count, duration, tracing.collect_events()
+
+
+def _get_compiled_schema_versions(
+    schema_versions: Iterable[Optional[str]],
+) -> List[str]:
+    return sorted(x for x in set(schema_versions) if x in SCHEMA_FILES)
+
+
+def _check_batch_files(
+    input_files: List[str],
+    result_files: List[str],
+    config_path: Optional[str],
+    worker_pools: List[batch.WorkerPool],
+) -> Iterator[Tuple[str, str, Optional[int], float]]:
+    """Check the files of a batch, yielding the input file, result file,
+    number of issues and check duration in seconds of each file as soon as it
+    completes. The number of issues is None if the check failed.
+    """
+    if len(worker_pools) == 1 and worker_pools[0].workers == 1:
+        schema_registry.preload_schemas(
+            _get_compiled_schema_versions(worker_pools[0].schema_versions)
+        )
+
+        for i in worker_pools[0].file_indices:
+            input_file, result_file = input_files[i], result_files[i]
+            start_time = time.perf_counter()
+            try:
+                issue_count = check_file(input_file, result_file, config_path)
+            except Exception:
+                logging.exception(f"An error occurred while checking {input_file}.")
+                issue_count = None
+
+            yield input_file, result_file, issue_count, time.perf_counter() - start_time
+
+        return
+
+    with ExitStack() as stack:
+        futures = {}
+        # All the workers are forked before any task is submitted, since
+        # submitting starts the threads of the executors
+        executors = worker_pool.create_worker_pools(
+            [
+                (x.workers, _get_compiled_schema_versions(x.schema_versions))
+                for x in worker_pools
+            ]
+        )
+        for executor in executors:
+            stack.enter_context(executor)
+
+        for pool, executor in zip(worker_pools, executors):
+            # Each worker process only gets the schemas of its pool and keeps
+            # them warm for all the files it checks. The executor only
+            # hands a new file to a worker once it is idle, so submitting in
+            # order of decreasing cost balances the load between the workers
+            for i in pool.file_indices:
+                future = executor.submit(
+                    _check_file_timed,
+                    input_files[i],
+                    result_files[i],
+                    config_path,
+                    tracing.is_tracing(),
+                )
+                futures[future] = input_files[i], result_files[i]
+
+        for future in as_completed(futures):
+            input_file, result_file = futures[future]
+            try:
+                issue_count, duration, events = future.result()
+                tracing.add_events(events)
+            except Exception:
+                logging.exception(f"An error occurred while checking {input_file}.")
+                issue_count, duration = None, 0.0
+
+            yield input_file, result_file, issue_count, duration
+
+
+def run_batch(
+    batch_path: str,
+    output_dir: str,
+    config_path: Optional[str] = None,
+    workers: int = 1,
+    cost_file: Optional[str] = None,
+):
+    """Check all the files of a batch, writing one result file per input file.
+    The files are checked largest first, according to the durations measured
+    in a prior run if available, otherwise according to their size.
+
+    Args:
+        batch_path (str): directory or text file listing the files to check
+        output_dir (str): directory of the result files
+        config_path (Optional[str]): configuration used for all the files of the batch
+        workers (int): number of worker processes. 1 checks the files in the
+            current process, 0 uses one worker per CPU
+        cost_file (Optional[str]): JSON file with the check durations of a
+            prior run. It is updated with the durations of this run
+    """
+    if workers == 0:
+        workers = os.cpu_count() or 1
+
+    input_files = batch.get_input_files(batch_path)
+    result_files = batch.get_result_files(input_files, output_dir)
+
+    file_costs = batch.load_file_costs(cost_file)
+    costs = batch.estimate_file_costs(input_files, file_costs)
+    order = batch.order_largest_first(input_files, costs)
+    input_files = [input_files[i] for i in order]
+    result_files = [result_files[i] for i in order]
+    costs = [costs[i] for i in order]
+
+    # Files are grouped by schema version so that each worker compiles as few
+    # schemas as possible
+    with tracing.trace_span("plan_batch"):
+        worker_pools = batch.plan_worker_pools(
+            batch.get_schema_versions(input_files), costs, workers
+        )
+    for pool in worker_pools:
+        logging.debug(
+            f"{pool.workers} worker(s) for {len(pool.file_indices)} "
+            f"files of schema versions {sorted(map(str, pool.schema_versions))}"
+        )
+
+    os.makedirs(output_dir, exist_ok=True)
+
+    logging.info(
+        f"Checking {len(input_files)} files from {batch_path} with {workers} worker(s)"
     )
 
-    # 5. Run data_type checks
-    execute_checker(data_type_checker.allowed_operators, checker_data)
-    execute_checker(
-        data_type_checker.non_negative_transition_time_in_light_state_action,
-        checker_data,
+    failed_files = 0
+    for input_file, result_file, issue_count, duration in _check_batch_files(
+        input_files, result_files, config_path, worker_pools
+    ):
+        if issue_count is None:
+            failed_files += 1
+        else:
+            logging.info(f"{input_file}: {issue_count} issues. Result in {result_file}")
+            file_costs[os.path.abspath(input_file)] = {
+                "size": batch.get_file_size(input_file),
+                "seconds": duration,
+            }
+
+    if cost_file is not None:
+        batch.save_file_costs(cost_file, file_costs)
+
+    logging.info(
+        f"Checked {len(input_files) - failed_files} of {len(input_files)} files"
     )
-    execute_checker(data_type_checker.positive_duration_in_phase, checker_data)
 
 
 def main():
@@ -231,35 +740,54 @@ def main():
 
     logging.info("Initializing checks")
 
-    if args.default_config:
+    if args.profile is not None:
+        profiling.start_profiling()
+    if args.trace is not None:
+        tracing.start_tracing()
+
+    if args.command == "serve":
+        server.serve(
+            check_file,
+            args.host,
+            args.port,
+            args.unix_socket,
+            args.workers,
+            args.queue_size,
+            args.config_path,
+        )
+    elif args.batch is not None:
+        run_batch(
+            args.batch, args.output_dir, args.config_path, args.jobs, args.cost_file
+        )
+    elif args.default_config:
         raise RuntimeError("Not implemented.")
     else:
         config = Configuration()
         config.load_from_file(xml_file_path=args.config_path)
 
-        result = Result()
-        result.register_checker_bundle(
-            name=constants.BUNDLE_NAME,
-            description="OpenScenario checker bundle",
-            version=constants.BUNDLE_VERSION,
-            summary="",
-        )
-        result.set_result_version(version=constants.BUNDLE_VERSION)
+        result = create_result()
 
-        run_checks(config, result)
+        checker_data = run_checks(config, result)
 
         result.copy_param_from_config(config)
 
-        result.write_to_file(
-            config.get_checker_bundle_param(
-                checker_bundle_name=constants.BUNDLE_NAME, param_name="resultFile"
-            ),
-            generate_summary=True,
+        result_file = config.get_checker_bundle_param(
+            checker_bundle_name=constants.BUNDLE_NAME, param_name="resultFile"
         )
+        with _phase("write_result"):
+            result.write_to_file(result_file, generate_summary=True)
+        _write_checker_metrics(checker_data, result_file)
 
         if args.generate_markdown:
             result.write_markdown_doc("generated_checker_bundle_doc.md")
 
+    if args.profile is not None:
+        profiling.write_profiles(args.profile)
+        logging.info(f"Profiles written to {args.profile}")
+    if args.trace is not None:
+        tracing.write_trace(args.trace)
+        logging.info(f"Trace written to {args.trace}")
+
     logging.info("Done")
 
 
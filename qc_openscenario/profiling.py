@@ -0,0 +1,80 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import cProfile
+import os
+import pstats
+
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+PROFILE_FILE_EXTENSION = ".pstats"
+SUMMARY_FILE_NAME = "summary.txt"
+SUMMARY_TOP_FUNCTIONS = 30
+
+# Profile of each phase, None when profiling is not started
+_profiles: Optional[Dict[str, cProfile.Profile]] = None
+
+
+def start_profiling() -> None:
+    """Profile the phases run from now on in this process, see profile_phase"""
+    global _profiles
+    _profiles = {}
+
+
+def is_profiling() -> bool:
+    return _profiles is not None
+
+
+@contextmanager
+def profile_phase(name: str) -> Iterator[None]:
+    """Profile the block as part of a phase, if profiling is started.
+    The profile of a phase accumulates all its runs, e.g. over the files of a
+    batch. Phases must not be nested, and must run on the main thread.
+
+    Args:
+        name (str): name of the phase, used as file name of its profile
+    """
+    if _profiles is None:
+        yield
+        return
+
+    profile = _profiles.get(name)
+    if profile is None:
+        profile = _profiles[name] = cProfile.Profile()
+
+    profile.enable()
+    try:
+        yield
+    finally:
+        profile.disable()
+
+
+def write_profiles(output_dir: str) -> None:
+    """Write the profile of each phase to a .pstats file, and a summary of the
+    functions taking the most time over all phases
+
+    Args:
+        output_dir (str): directory of the files, created if needed
+    """
+    if not _profiles:
+        return
+
+    os.makedirs(output_dir, exist_ok=True)
+
+    profile_files = []
+    for name, profile in _profiles.items():
+        profile_file = os.path.join(output_dir, name + PROFILE_FILE_EXTENSION)
+        profile.dump_stats(profile_file)
+        profile_files.append(profile_file)
+
+    with open(os.path.join(output_dir, SUMMARY_FILE_NAME), "w") as file:
+        stats = pstats.Stats(*profile_files, stream=file)
+        stats.strip_dirs()
+
+        # Hot spots by own time, then by time including the callees
+        for sort_key in [pstats.SortKey.TIME, pstats.SortKey.CUMULATIVE]:
+            stats.sort_stats(sort_key).print_stats(SUMMARY_TOP_FUNCTIONS)
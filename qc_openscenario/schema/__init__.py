@@ -5,3 +5,4 @@
 # with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
 
 from . import schema_files as schema_files
+from . import schema_registry as schema_registry
@@ -0,0 +1,113 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import importlib.resources
+import logging
+import threading
+
+from typing import Iterable, Optional
+
+from lxml import etree
+
+from qc_openscenario.schema import schema_files
+
+# Compiled schemas are kept for the life of the process, keyed by schema version
+_compiled_schemas: dict[str, etree.XMLSchema] = {}
+_registry_lock = threading.Lock()
+
+# lxml validators store the errors of the last validation on the schema object
+# itself, hence validations against the same schema must not interleave
+_validation_locks: dict[str, threading.Lock] = {}
+
+
+def get_schema_file_path(schema_version: Optional[str]) -> Optional[str]:
+    """Get the path of the xsd file of the given OpenSCENARIO version
+
+    Args:
+        schema_version (Optional[str]): the version, e.g. "1.2.0"
+
+    Returns:
+        Optional[str]: the xsd file path. None if no schema exists for the version
+    """
+    xsd_file = schema_files.SCHEMA_FILES.get(schema_version)
+    if xsd_file is None:
+        return None
+
+    return str(importlib.resources.files("qc_openscenario.schema").joinpath(xsd_file))
+
+
+def get_schema(schema_version: Optional[str]) -> Optional[etree.XMLSchema]:
+    """Get the compiled schema of the given OpenSCENARIO version.
+    The schema is compiled on first access and reused afterwards.
+
+    Args:
+        schema_version (Optional[str]): the version, e.g. "1.2.0"
+
+    Returns:
+        Optional[etree.XMLSchema]: the compiled schema. None if no schema exists for the version
+    """
+    schema = _compiled_schemas.get(schema_version)
+    if schema is not None:
+        return schema
+
+    xsd_file_path = get_schema_file_path(schema_version)
+    if xsd_file_path is None:
+        return None
+
+    with _registry_lock:
+        # Another thread may have compiled the schema while waiting for the lock
+        schema = _compiled_schemas.get(schema_version)
+        if schema is None:
+            logging.debug(f"Compiling schema {xsd_file_path}")
+            schema = etree.XMLSchema(etree.parse(xsd_file_path))
+            _validation_locks[schema_version] = threading.Lock()
+            _compiled_schemas[schema_version] = schema
+
+    return schema
+
+
+def get_compiled_schema_versions() -> list[str]:
+    """Get the versions of the schemas compiled so far in this process"""
+    return sorted(_compiled_schemas)
+
+
+def preload_schemas(schema_versions: Optional[Iterable[str]] = None) -> None:
+    """Compile schemas ahead of the first validation
+
+    Args:
+        schema_versions (Optional[Iterable[str]]): versions to compile.
+            All the versions in SCHEMA_FILES if not specified
+    """
+    if schema_versions is None:
+        schema_versions = schema_files.SCHEMA_FILES.keys()
+
+    for schema_version in schema_versions:
+        get_schema(schema_version)
+
+
+def validate(
+    schema_version: str, xml_tree: etree._ElementTree
+) -> tuple[bool, etree._ListErrorLog]:
+    """Validate a tree against the compiled schema of the given version
+
+    Args:
+        schema_version (str): the version, e.g. "1.2.0"
+        xml_tree (etree._ElementTree): the tree to validate
+
+    Raises:
+        KeyError: if no schema exists for the version
+
+    Returns:
+        tuple[bool, etree._ListErrorLog]: True if the tree is valid and
+            a copy of the validation errors, which is safe to use after the call
+    """
+    schema = get_schema(schema_version)
+    if schema is None:
+        raise KeyError(f"No schema file for version {schema_version}")
+
+    with _validation_locks[schema_version]:
+        is_valid = schema.validate(xml_tree)
+        return is_valid, schema.error_log.copy()
@@ -0,0 +1,346 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import json
+import logging
+import os
+import socketserver
+import tempfile
+import threading
+
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Optional
+from urllib.parse import parse_qs, urlparse
+
+from qc_baselib.models.result import CheckerResults
+
+from qc_openscenario import worker_pool
+from qc_openscenario.schema import schema_registry
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8080
+DEFAULT_QUEUE_SIZE = 16
+RESULT_FORMATS = {"xml": "application/xml", "json": "application/json"}
+
+# Checks a single input file and writes its result file, e.g. main.check_file
+CheckFile = Callable[[str, str, Optional[str]], int]
+
+
+def _check_file_and_read_result(
+    check_file: CheckFile,
+    input_file: str,
+    result_file: str,
+    config_path: Optional[str],
+) -> tuple[int, bytes]:
+    issue_count = check_file(input_file, result_file, config_path)
+    with open(result_file, "rb") as file:
+        return issue_count, file.read()
+
+
+class ValidationService:
+    """Checks the files received by the server in a pool of worker processes.
+    The workers are forked from the server process after it compiled all the
+    schemas, and keep their cached road network facts for all the files
+    they check. At most workers +
+    queue_size files are accepted at the same time, further requests are
+    rejected until a slot is free. If a worker dies, e.g. killed when out of
+    memory, the files it was checking fail and the pool is replaced.
+    """
+
+    def __init__(
+        self,
+        check_file: CheckFile,
+        workers: int = 1,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        config_path: Optional[str] = None,
+    ):
+        self.check_file = check_file
+        self.workers = workers
+        self.capacity = workers + queue_size
+        self.config_path = config_path
+
+        self._slots = threading.BoundedSemaphore(self.capacity)
+        self._pending_lock = threading.Lock()
+        self._pending = 0
+        self._executor_lock = threading.Lock()
+        self._restarting = False
+        self._executor = worker_pool.create_worker_pool(workers)
+
+    @property
+    def degraded(self) -> bool:
+        """True while the pool is replaced after a worker died"""
+        return self._restarting
+
+    @property
+    def pending(self) -> int:
+        """Number of files being checked or waiting for a worker"""
+        with self._pending_lock:
+            return self._pending
+
+    def try_acquire(self) -> bool:
+        """Reserve a slot for a new file. False if the server is saturated"""
+        if not self._slots.acquire(blocking=False):
+            return False
+
+        with self._pending_lock:
+            self._pending += 1
+        return True
+
+    def release(self) -> None:
+        with self._pending_lock:
+            self._pending -= 1
+        self._slots.release()
+
+    def check(self, input_file: str, result_file: str) -> tuple[int, bytes]:
+        """Check a file in a worker, in a slot reserved with try_acquire
+
+        Returns:
+            tuple[int, bytes]: the number of issues and the content of the result file
+        """
+        # Waits for the pool being replaced, if any
+        with self._executor_lock:
+            executor = self._executor
+
+        try:
+            future = executor.submit(
+                _check_file_and_read_result,
+                self.check_file,
+                input_file,
+                result_file,
+                self.config_path,
+            )
+            return future.result()
+        except BrokenProcessPool:
+            self._replace_executor(executor)
+            raise
+
+    def _replace_executor(self, broken_executor: ProcessPoolExecutor) -> None:
+        with self._executor_lock:
+            # Another request may have replaced it already
+            if self._executor is not broken_executor:
+                return
+
+            logging.error("A worker process died, restarting the worker pool.")
+            self._restarting = True
+            try:
+                broken_executor.shutdown(wait=False)
+                self._executor = worker_pool.create_worker_pool(self.workers)
+            finally:
+                self._restarting = False
+
+    def shutdown(self) -> None:
+        with self._executor_lock:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+def format_result(result_xml: bytes, result_format: str) -> bytes:
+    """Convert the content of a result file to the requested format
+
+    Args:
+        result_xml (bytes): content of the result file
+        result_format (str): "xml" or "json"
+
+    Returns:
+        bytes: the result in the requested format
+    """
+    if result_format == "json":
+        return CheckerResults.from_xml(result_xml).model_dump_json().encode()
+
+    return result_xml
+
+
+class CheckRequestHandler(BaseHTTPRequestHandler):
+    """HTTP API of the server
+
+    GET /health
+        Status of the server as JSON.
+    POST /check?path=<file>[&format=xml|json]
+        Check a file readable by the server.
+    POST /check[?format=xml|json] with the file content as body
+        Check the raw bytes of a file.
+    """
+
+    server_version = "QCOpenScenarioServer"
+
+    @property
+    def service(self) -> ValidationService:
+        return self.server.service
+
+    def log_message(self, format, *args):
+        logging.debug(f"{self.address_string()} - {format % args}")
+
+    def _send(
+        self,
+        status: HTTPStatus,
+        body: bytes,
+        content_type: str = "application/json",
+        headers: Optional[dict] = None,
+    ) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, status: HTTPStatus, message: str, headers=None) -> None:
+        self._send(status, json.dumps({"error": message}).encode(), headers=headers)
+
+    def do_GET(self):
+        if urlparse(self.path).path != "/health":
+            self._send_error(HTTPStatus.NOT_FOUND, f"Unknown endpoint {self.path}")
+            return
+
+        status = {
+            "status": "degraded" if self.service.degraded else "ok",
+            "workers": self.service.workers,
+            "capacity": self.service.capacity,
+            "pending": self.service.pending,
+            "schemas": schema_registry.get_compiled_schema_versions(),
+        }
+        self._send(HTTPStatus.OK, json.dumps(status).encode())
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path != "/check":
+            self._send_error(HTTPStatus.NOT_FOUND, f"Unknown endpoint {url.path}")
+            return
+
+        query = parse_qs(url.query)
+        result_format = query.get("format", ["xml"])[0]
+        if result_format not in RESULT_FORMATS:
+            self._send_error(
+                HTTPStatus.BAD_REQUEST, f"Unknown result format {result_format}"
+            )
+            return
+
+        content = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        input_file = query.get("path", [None])[0]
+        if input_file is None and not content:
+            self._send_error(
+                HTTPStatus.BAD_REQUEST, "Either a path or a file content is required"
+            )
+            return
+
+        # Reject instead of queueing without bound, so that clients can retry later
+        if not self.service.try_acquire():
+            self._send_error(
+                HTTPStatus.SERVICE_UNAVAILABLE,
+                "Too many pending checks",
+                headers={"Retry-After": "1"},
+            )
+            return
+
+        try:
+            with tempfile.TemporaryDirectory() as temp_dir:
+                if input_file is None:
+                    input_file = os.path.join(temp_dir, "input.xosc")
+                    with open(input_file, "wb") as file:
+                        file.write(content)
+
+                issue_count, result_xml = self.service.check(
+                    input_file, os.path.join(temp_dir, "result.xqar")
+                )
+        except Exception as e:
+            logging.exception(f"An error occurred while checking {input_file}.")
+            self._send_error(HTTPStatus.INTERNAL_SERVER_ERROR, str(e))
+            return
+        finally:
+            self.service.release()
+
+        self._send(
+            HTTPStatus.OK,
+            format_result(result_xml, result_format),
+            content_type=RESULT_FORMATS[result_format],
+            headers={"X-Issue-Count": str(issue_count)},
+        )
+
+
+class UnixSocketRequestHandler(CheckRequestHandler):
+    def address_string(self):
+        # Unix socket clients have no address
+        return "unix"
+
+
+class ThreadingUnixHTTPServer(
+    socketserver.ThreadingMixIn, socketserver.UnixStreamServer
+):
+    daemon_threads = True
+
+
+def create_server(
+    service: ValidationService,
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    unix_socket: Optional[str] = None,
+) -> socketserver.BaseServer:
+    """Create the server of the HTTP API, over a Unix socket or a TCP port
+
+    Args:
+        service (ValidationService): the service checking the files
+        host (str): host of the TCP server
+        port (int): port of the TCP server. 0 picks a free port
+        unix_socket (Optional[str]): path of the Unix socket. Used instead of
+            the TCP server if specified
+
+    Returns:
+        socketserver.BaseServer: the server, not started yet
+    """
+    if unix_socket is not None:
+        if os.path.exists(unix_socket):
+            os.remove(unix_socket)
+        server = ThreadingUnixHTTPServer(unix_socket, UnixSocketRequestHandler)
+    else:
+        server = ThreadingHTTPServer((host, port), CheckRequestHandler)
+
+    server.service = service
+    return server
+
+
+def serve(
+    check_file: CheckFile,
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    unix_socket: Optional[str] = None,
+    workers: int = 1,
+    queue_size: int = DEFAULT_QUEUE_SIZE,
+    config_path: Optional[str] = None,
+) -> None:
+    """Run the server until interrupted
+
+    Args:
+        check_file (CheckFile): function checking a file, e.g. main.check_file
+        host (str): host of the TCP server
+        port (int): port of the TCP server
+        unix_socket (Optional[str]): path of the Unix socket. Used instead of
+            the TCP server if specified
+        workers (int): number of worker processes. 0 uses one worker per CPU
+        queue_size (int): number of files waiting for a worker above which
+            requests are rejected
+        config_path (Optional[str]): configuration used for all the files
+    """
+    if workers == 0:
+        workers = os.cpu_count() or 1
+
+    service = ValidationService(check_file, workers, queue_size, config_path)
+    server = create_server(service, host, port, unix_socket)
+
+    address = unix_socket if unix_socket is not None else f"http://{host}:{port}"
+    logging.info(f"Serving on {address} with {workers} worker(s)")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.shutdown()
+        if unix_socket is not None and os.path.exists(unix_socket):
+            os.remove(unix_socket)
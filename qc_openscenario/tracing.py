@@ -0,0 +1,158 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import json
+import os
+import threading
+import time
+
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional
+
+# Trace events recorded in this process, None when tracing is not started.
+# Appending to a list is atomic, so spans of all threads are recorded here
+_events: Optional[List[Dict]] = None
+# Events of the spans of a thread captured aside, see capture_events
+_local = threading.local()
+
+
+def start_tracing() -> None:
+    """Record the spans run from now on in this process, see trace_span.
+    Events recorded before are discarded.
+    """
+    global _events
+    _events = []
+
+
+def is_tracing() -> bool:
+    return _events is not None
+
+
+def collect_events() -> List[Dict]:
+    """Take the events recorded so far in this process, e.g. to send them
+    from a worker process to the process writing the trace"""
+    if _events is None:
+        return []
+
+    events = list(_events)
+    _events.clear()
+    return events
+
+
+def add_events(events: Iterable[Dict]) -> None:
+    """Add events recorded in another process"""
+    if _events is not None:
+        _events.extend(events)
+
+
+@contextmanager
+def capture_events() -> Iterator[List[Dict]]:
+    """Record the spans run by the current thread within the block in the
+    yielded list instead, e.g. to add them later with add_events or to drop
+    them"""
+    previous_events = getattr(_local, "events", None)
+    _local.events = events = []
+    try:
+        yield events
+    finally:
+        _local.events = previous_events
+
+
+@contextmanager
+def trace_span(name: str, category: str = "phase", **args) -> Iterator[Dict]:
+    """Record the block as a span of the current process and thread, if
+    tracing is started.
+
+    Args:
+        name (str): name of the span
+        category (str): category of the span, to filter spans in the viewer
+        args: details shown with the span
+
+    Yields:
+        Dict: the details of the span, to which more can be added in the block
+    """
+    if _events is None:
+        yield args
+        return
+
+    start_time = time.perf_counter()
+    try:
+        yield args
+    finally:
+        end_time = time.perf_counter()
+        events = getattr(_local, "events", None)
+        if events is None:
+            events = _events
+        events.append(
+            {
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                # Timestamps in microseconds. perf_counter is a system-wide
+                # clock, so that the spans of all the processes line up
+                "ts": start_time * 1e6,
+                "dur": (end_time - start_time) * 1e6,
+                "pid": os.getpid(),
+                "tid": threading.get_native_id(),
+                "args": args,
+            }
+        )
+
+
+def _get_track_names(events: List[Dict]) -> List[Dict]:
+    main_pid = os.getpid()
+    pids = sorted({x["pid"] for x in events} | {main_pid})
+
+    track_names = []
+    for index, pid in enumerate(x for x in pids if x != main_pid):
+        track_names.append(
+            {
+                "name": "process_name",
+                "ph": "M",
+                "pid": pid,
+                "args": {"name": f"Worker {index + 1} (pid {pid})"},
+            }
+        )
+    track_names.append(
+        {
+            "name": "process_name",
+            "ph": "M",
+            "pid": main_pid,
+            "args": {"name": f"Main process (pid {main_pid})"},
+        }
+    )
+    # The main process is shown first
+    for pid in pids:
+        track_names.append(
+            {
+                "name": "process_sort_index",
+                "ph": "M",
+                "pid": pid,
+                "args": {"sort_index": -1 if pid == main_pid else pid},
+            }
+        )
+
+    return track_names
+
+
+def write_trace(trace_file: str) -> None:
+    """Write the recorded events as a Chrome trace event file, which can be
+    opened offline in Perfetto or chrome://tracing. Each process has its own
+    track, with a row per thread.
+
+    Args:
+        trace_file (str): path of the file to write
+    """
+    events = _events or []
+
+    with open(trace_file, "w") as file:
+        json.dump(
+            {
+                "traceEvents": _get_track_names(events) + events,
+                "displayTimeUnit": "ms",
+            },
+            file,
+        )
@@ -0,0 +1,116 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import gc
+import logging
+import multiprocessing
+import time
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from qc_openscenario.schema import schema_registry
+
+
+def _launch_workers(executor: ProcessPoolExecutor) -> None:
+    # Fork all the workers of the pool without submitting a task, which would
+    # start the threads of the executor. Recent versions fork them all in
+    # _launch_processes. Elsewhere, each call of _adjust_process_count forks
+    # at most one worker
+    launch_processes = getattr(executor, "_launch_processes", None)
+    if launch_processes is not None:
+        launch_processes()
+        return
+
+    while len(executor._processes) < executor._max_workers:
+        process_count = len(executor._processes)
+        executor._adjust_process_count()
+        if len(executor._processes) == process_count:
+            break
+
+
+def create_worker_pools(
+    pools: Sequence[Tuple[int, Optional[Iterable[str]]]],
+) -> List[ProcessPoolExecutor]:
+    """Create pools of worker processes with compiled schemas.
+    Where fork is available, the schemas are compiled once in the current
+    process and the workers are forked from it, so that they share the
+    imported modules and compiled schemas copy-on-write instead of importing
+    and compiling them again. The workers of all the pools are started before
+    returning, before any task is submitted, hence before any pool starts its
+    threads. Forking while threads run could deadlock the workers on locks
+    held by those threads. Elsewhere, each worker compiles the schemas of its
+    pool when it starts.
+
+    Args:
+        pools (Sequence[Tuple[int, Optional[Iterable[str]]]]): number of
+            worker processes and versions to compile of each pool. All the
+            versions in SCHEMA_FILES if the versions are not specified
+
+    Returns:
+        List[ProcessPoolExecutor]: the pools, in the given order
+    """
+    pools = [(workers, list(x) if x is not None else None) for workers, x in pools]
+
+    if "fork" not in multiprocessing.get_all_start_methods():
+        return [
+            ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=schema_registry.preload_schemas,
+                initargs=(schema_versions,),
+            )
+            for workers, schema_versions in pools
+        ]
+
+    start_time = time.perf_counter()
+    for _, schema_versions in pools:
+        schema_registry.preload_schemas(schema_versions)
+
+    # Objects tracked by the garbage collector are moved to a permanent
+    # generation, so that collections in the workers do not write to, hence
+    # copy, the pages shared with this process
+    gc.collect()
+    gc.freeze()
+    try:
+        executors = []
+        for workers, _ in pools:
+            executor = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("fork")
+            )
+            executors.append(executor)
+            _launch_workers(executor)
+    finally:
+        gc.unfreeze()
+
+    # The threads of the executors only start once all the workers are forked.
+    # Without them, shutting down a pool which never ran a task would not
+    # stop its workers
+    for executor in executors:
+        executor._start_executor_manager_thread()
+
+    logging.debug(
+        f"Started {sum(x for x, _ in pools)} worker(s) in "
+        f"{time.perf_counter() - start_time:.3f} s"
+    )
+
+    return executors
+
+
+def create_worker_pool(
+    workers: int, schema_versions: Optional[Iterable[str]] = None
+) -> ProcessPoolExecutor:
+    """Create a pool of worker processes with compiled schemas, see
+    create_worker_pools
+
+    Args:
+        workers (int): number of worker processes
+        schema_versions (Optional[Iterable[str]]): versions to compile.
+            All the versions in SCHEMA_FILES if not specified
+
+    Returns:
+        ProcessPoolExecutor: the pool
+    """
+    return create_worker_pools([(workers, schema_versions)])[0]
@@ -0,0 +1,90 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import pytest
+from lxml import etree
+from qc_baselib import StatusType
+from qc_openscenario.api import validate
+from qc_openscenario.checks import basic_checker, reference_checker, schema_checker
+
+
+def read_bytes(path: str) -> bytes:
+    with open(path, "rb") as file:
+        return file.read()
+
+
+def test_validate_bytes() -> None:
+    result = validate(
+        read_bytes("tests/data/valid_schema/xml.valid_schema.negative.xosc")
+    )
+
+    assert (
+        result.get_checker_status(schema_checker.valid_schema.CHECKER_ID)
+        == StatusType.COMPLETED
+    )
+    assert (
+        len(result.get_issues_by_rule_uid("asam.net:xosc:1.0.0:xml.valid_schema")) == 1
+    )
+
+
+def test_validate_invalid_bytes() -> None:
+    result = validate(b"<OpenSCENARIO><FileHeader")
+
+    assert (
+        len(result.get_issues_by_rule_uid("asam.net:xosc:1.0.0:xml.valid_xml_document"))
+        == 1
+    )
+
+
+def test_validate_tree() -> None:
+    tree = etree.parse("tests/data/default_namespace/default_namespace.xosc")
+    namespace = etree.QName(tree.getroot()).namespace
+
+    result = validate(tree)
+
+    assert (
+        result.get_checker_status(schema_checker.valid_schema.CHECKER_ID)
+        == StatusType.COMPLETED
+    )
+    assert result.get_issue_count() == 0
+    # The tree of the caller is not modified
+    assert etree.QName(tree.getroot()).namespace == namespace
+
+
+@pytest.mark.parametrize("xodr_as_bytes", [False, True])
+def test_validate_xodr(xodr_as_bytes: bool) -> None:
+    base_path = "tests/data/resolvable_signal_id_in_traffic_signal_state_action/"
+    xodr = base_path + "test.xodr"
+    if xodr_as_bytes:
+        xodr = read_bytes(xodr)
+    checker = reference_checker.resolvable_signal_id_in_traffic_signal_state_action
+
+    result = validate(
+        read_bytes(
+            base_path
+            + "reference_control.resolvable_signal_id_in_traffic_signal_state_action.negative.xosc"
+        ),
+        xodr=xodr,
+        checks=[checker.CHECKER_ID],
+    )
+
+    assert result.get_checker_status(checker.CHECKER_ID) == StatusType.COMPLETED
+    assert len(result.get_issues_by_rule_uid(checker.RULE_UID)) == 1
+
+    # Only the requested checker and its preconditions are run
+    assert set(result.get_checker_ids(checker_bundle_name="xoscBundle")) == {
+        checker.CHECKER_ID,
+        schema_checker.valid_schema.CHECKER_ID,
+        basic_checker.valid_xml_document.CHECKER_ID,
+        basic_checker.root_tag_is_openscenario.CHECKER_ID,
+        basic_checker.fileheader_is_present.CHECKER_ID,
+        basic_checker.version_is_defined.CHECKER_ID,
+    }
+
+
+def test_validate_unknown_checker() -> None:
+    with pytest.raises(ValueError):
+        validate(b"<OpenSCENARIO/>", checks=["unknown_checker"])
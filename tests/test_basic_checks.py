@@ -8,7 +8,7 @@ import os
 import pytest
 import test_utils
 from qc_baselib import Result, IssueSeverity, StatusType
-from qc_openscenario.checks import basic_checker
+from qc_openscenario.checks import basic_checker, schema_checker
 
 
 def test_valid_xml_document_positive(
@@ -64,6 +64,54 @@ def test_valid_xml_document_negative(
     test_utils.cleanup_files()
 
 
+def test_valid_xml_document_non_existing_file(
+    monkeypatch,
+) -> None:
+    base_path = "tests/data/valid_xml_document/"
+    target_file_name = f"xml.valid_xml_document.non_existing.xosc"
+    target_file_path = os.path.join(base_path, target_file_name)
+
+    test_utils.create_test_config(target_file_path)
+
+    test_utils.launch_main(monkeypatch)
+
+    result = Result()
+    result.load_from_file(test_utils.REPORT_FILE_PATH)
+
+    assert (
+        result.get_checker_status(basic_checker.valid_xml_document.CHECKER_ID)
+        == StatusType.ERROR
+    )
+    assert (
+        result.get_checker_status(basic_checker.root_tag_is_openscenario.CHECKER_ID)
+        == StatusType.SKIPPED
+    )
+
+    test_utils.cleanup_files()
+
+
+def test_default_namespace(
+    monkeypatch,
+) -> None:
+    base_path = "tests/data/default_namespace/"
+    target_file_name = f"default_namespace.xosc"
+    target_file_path = os.path.join(base_path, target_file_name)
+
+    test_utils.create_test_config(target_file_path)
+
+    test_utils.launch_main(monkeypatch)
+
+    result = Result()
+    result.load_from_file(test_utils.REPORT_FILE_PATH)
+
+    assert (
+        result.get_checker_status(schema_checker.valid_schema.CHECKER_ID)
+        == StatusType.COMPLETED
+    )
+    assert result.get_issue_count() == 0
+    test_utils.cleanup_files()
+
+
 def test_parametric_input_xodr(
     monkeypatch,
 ) -> None:
@@ -315,3 +363,92 @@ def test_version_is_defined_negative_type(
     assert len(xml_doc_issues) == 1
     assert xml_doc_issues[0].level == IssueSeverity.ERROR
     test_utils.cleanup_files()
+
+
+@pytest.mark.parametrize(
+    "target_file,checker_id,issue_count",
+    [
+        (
+            "tests/data/root_tag_is_openscenario/negative.xosc",
+            basic_checker.root_tag_is_openscenario.CHECKER_ID,
+            1,
+        ),
+        (
+            "tests/data/fileheader_is_present/negative.xosc",
+            basic_checker.fileheader_is_present.CHECKER_ID,
+            1,
+        ),
+        (
+            "tests/data/version_is_defined/negative_no_attr.xosc",
+            basic_checker.version_is_defined.CHECKER_ID,
+            1,
+        ),
+        (
+            "tests/data/valid_schema/xml.valid_schema.negative.xosc",
+            basic_checker.version_is_defined.CHECKER_ID,
+            0,
+        ),
+    ],
+)
+def test_triage_only(
+    target_file: str,
+    checker_id: str,
+    issue_count: int,
+    monkeypatch,
+) -> None:
+    test_utils.create_test_config(target_file, {"triageOnly": "true"})
+
+    test_utils.launch_main(monkeypatch)
+
+    result = Result()
+    result.load_from_file(test_utils.REPORT_FILE_PATH)
+
+    assert result.get_checker_status(checker_id) == StatusType.COMPLETED
+    assert result.get_issue_count() == issue_count
+
+    # The schema is not checked, as the file is not fully parsed
+    assert (
+        result.get_checker_status(schema_checker.valid_schema.CHECKER_ID)
+        == StatusType.SKIPPED
+    )
+
+    test_utils.cleanup_files()
+
+
+@pytest.mark.parametrize(
+    "content,row,column",
+    [
+        ('<?xml version="1.0"?>\n<OpenSCENARIO>\n<FileHead', 3, 9),
+        # Truncated after the FileHeader
+        (
+            "<OpenSCENARIO><FileHeader revMajor='1' revMinor='2'/><Entities><Foo",
+            1,
+            67,
+        ),
+        ("", 1, 0),
+    ],
+)
+def test_triage_only_truncated_file(
+    monkeypatch, tmp_path, content: str, row: int, column: int
+) -> None:
+    target_file_path = tmp_path / "truncated.xosc"
+    target_file_path.write_text(content)
+
+    test_utils.create_test_config(str(target_file_path), {"triageOnly": "true"})
+
+    test_utils.launch_main(monkeypatch)
+
+    result = Result()
+    result.load_from_file(test_utils.REPORT_FILE_PATH)
+
+    issues = result.get_issues_by_rule_uid("asam.net:xosc:1.0.0:xml.valid_xml_document")
+    assert len(issues) == 1
+    # Same location as when the whole file is parsed
+    file_location = issues[0].locations[0].file_location[0]
+    assert (file_location.row, file_location.column) == (row, column)
+    assert (
+        result.get_checker_status(basic_checker.root_tag_is_openscenario.CHECKER_ID)
+        == StatusType.SKIPPED
+    )
+
+    test_utils.cleanup_files()
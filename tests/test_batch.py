@@ -0,0 +1,263 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import gc
+import multiprocessing
+import os
+import sys
+import threading
+import types
+import pytest
+import qc_openscenario.main as main
+from concurrent.futures import ProcessPoolExecutor
+from qc_baselib import Result, StatusType
+from qc_openscenario import batch, worker_pool
+from qc_openscenario.checks import basic_checker, schema_checker
+from qc_openscenario.schema import schema_registry
+
+
+def launch_batch(monkeypatch, batch_path: str, output_dir: str, jobs: int = 1):
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        [
+            "main.py",
+            "--batch",
+            batch_path,
+            "--output_dir",
+            output_dir,
+            "--jobs",
+            str(jobs),
+        ],
+    )
+    main.main()
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_batch_directory(monkeypatch, tmp_path, jobs: int) -> None:
+    batch_path = "tests/data/valid_schema/"
+
+    launch_batch(monkeypatch, batch_path, str(tmp_path), jobs)
+
+    input_files = batch.get_input_files(batch_path)
+    assert len(input_files) > 1
+    assert sorted(os.listdir(tmp_path)) == sorted(
+        os.path.splitext(os.path.basename(x))[0] + ".xqar" for x in input_files
+    )
+
+    result = Result()
+    result.load_from_file(str(tmp_path / "xml.valid_schema.negative.xqar"))
+    assert (
+        result.get_checker_status(schema_checker.valid_schema.CHECKER_ID)
+        == StatusType.COMPLETED
+    )
+    assert (
+        len(result.get_issues_by_rule_uid("asam.net:xosc:1.0.0:xml.valid_schema")) == 1
+    )
+
+
+def test_batch_list(monkeypatch, tmp_path) -> None:
+    list_path = tmp_path / "batch.txt"
+    list_path.write_text(
+        "# Files to check\n"
+        f"{os.path.abspath('tests/data/valid_xml_document/xml.valid_xml_document.negative.xosc')}\n"
+        "\n"
+        f"{os.path.abspath('tests/data/fileheader_is_present/positive.xosc')}\n"
+        f"{os.path.abspath('tests/data/root_tag_is_openscenario/positive.xosc')}\n"
+    )
+    output_dir = tmp_path / "results"
+
+    launch_batch(monkeypatch, str(list_path), str(output_dir))
+
+    assert sorted(os.listdir(output_dir)) == [
+        "positive.xqar",
+        "positive_1.xqar",
+        "xml.valid_xml_document.negative.xqar",
+    ]
+
+    result = Result()
+    result.load_from_file(str(output_dir / "xml.valid_xml_document.negative.xqar"))
+    assert (
+        len(result.get_issues_by_rule_uid("asam.net:xosc:1.0.0:xml.valid_xml_document"))
+        == 1
+    )
+    assert (
+        result.get_checker_status(basic_checker.root_tag_is_openscenario.CHECKER_ID)
+        == StatusType.SKIPPED
+    )
+
+
+def test_batch_largest_first(tmp_path) -> None:
+    small_file = tmp_path / "small.xosc"
+    small_file.write_text("<a/>")
+    large_file = tmp_path / "large.xosc"
+    large_file.write_text("<a>" + "<b/>" * 100 + "</a>")
+    input_files = [str(small_file), str(large_file)]
+
+    costs = batch.estimate_file_costs(input_files, {})
+    assert batch.order_largest_first(input_files, costs) == [1, 0]
+
+    # A duration measured in a prior run takes precedence over the size
+    file_costs = {
+        os.path.abspath(small_file): {
+            "size": small_file.stat().st_size,
+            "seconds": 2.0,
+        },
+        os.path.abspath(large_file): {
+            "size": large_file.stat().st_size,
+            "seconds": 1.0,
+        },
+    }
+    costs = batch.estimate_file_costs(input_files, file_costs)
+    assert batch.order_largest_first(input_files, costs) == [0, 1]
+
+    # A measurement is ignored once the file has changed
+    small_file.write_text("<a></a>")
+    costs = batch.estimate_file_costs(input_files, file_costs)
+    assert batch.order_largest_first(input_files, costs) == [1, 0]
+
+
+def test_batch_cost_file(monkeypatch, tmp_path) -> None:
+    batch_path = "tests/data/valid_schema/"
+    cost_file = tmp_path / "costs.json"
+    output_dir = tmp_path / "results"
+
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        [
+            "main.py",
+            "--batch",
+            batch_path,
+            "--output_dir",
+            str(output_dir),
+            "--cost_file",
+            str(cost_file),
+        ],
+    )
+    main.main()
+
+    file_costs = batch.load_file_costs(str(cost_file))
+    assert sorted(file_costs) == sorted(
+        os.path.abspath(x) for x in batch.get_input_files(batch_path)
+    )
+    assert all(x["seconds"] > 0 for x in file_costs.values())
+
+
+# Files left open raise a ResourceWarning when collected
+@pytest.mark.filterwarnings("error::ResourceWarning")
+@pytest.mark.filterwarnings("error::pytest.PytestUnraisableExceptionWarning")
+def test_batch_schema_versions() -> None:
+    input_files = [
+        "tests/data/valid_schema/xml.valid_schema.positive.xosc",
+        "tests/data/fileheader_is_present/negative.xosc",
+    ]
+
+    assert batch.get_schema_versions(input_files) == ["1.3.0", None]
+    # The files are closed once their header is read
+    gc.collect()
+
+
+@pytest.mark.parametrize(
+    "workers,expected_pools",
+    [
+        # More workers than versions: one pool per version, sized by cost
+        (4, [(3, {"1.2.0"}, [0, 2, 4]), (1, {"1.1.0"}, [1, 3])]),
+        # Never more workers than files in a pool
+        (8, [(3, {"1.2.0"}, [0, 2, 4]), (2, {"1.1.0"}, [1, 3])]),
+        # Fewer workers than versions: versions shared between single workers
+        (1, [(1, {"1.2.0", "1.1.0"}, [0, 1, 2, 3, 4])]),
+    ],
+)
+def test_batch_plan_worker_pools(workers: int, expected_pools: list) -> None:
+    schema_versions = ["1.2.0", "1.1.0", "1.2.0", "1.1.0", "1.2.0"]
+    costs = [10.0, 2.0, 10.0, 1.0, 10.0]
+
+    worker_pools = batch.plan_worker_pools(schema_versions, costs, workers)
+
+    assert [
+        (x.workers, x.schema_versions, x.file_indices) for x in worker_pools
+    ] == expected_pools
+
+
+def test_batch_plan_worker_pools_balanced() -> None:
+    schema_versions = ["1.0.0", "1.1.0", "1.2.0", "1.3.0"]
+    costs = [5.0, 4.0, 3.0, 2.0]
+
+    worker_pools = batch.plan_worker_pools(schema_versions, costs, 2)
+
+    assert [x.schema_versions for x in worker_pools] == [
+        {"1.0.0", "1.3.0"},
+        {"1.1.0", "1.2.0"},
+    ]
+
+
+def test_worker_pool() -> None:
+    with worker_pool.create_worker_pool(2, ["1.3.0"]) as executor:
+        # Workers start with the schemas already compiled
+        futures = [
+            executor.submit(schema_registry.get_compiled_schema_versions)
+            for _ in range(4)
+        ]
+        assert all("1.3.0" in x.result() for x in futures)
+
+
+def test_worker_pool_shutdown_without_task() -> None:
+    executor = worker_pool.create_worker_pool(2, ["1.3.0"])
+    processes = list(executor._processes.values())
+    assert len(processes) == 2
+
+    executor.shutdown()
+
+    assert not any(x.is_alive() for x in processes)
+
+
+@pytest.mark.skipif(
+    "fork" not in multiprocessing.get_all_start_methods(), reason="Requires fork"
+)
+def test_launch_workers_without_launch_processes() -> None:
+    executor = ProcessPoolExecutor(
+        max_workers=3, mp_context=multiprocessing.get_context("fork")
+    )
+    try:
+        # As on Python versions without _launch_processes
+        worker_pool._launch_workers(
+            types.SimpleNamespace(
+                _processes=executor._processes,
+                _max_workers=executor._max_workers,
+                _adjust_process_count=executor._adjust_process_count,
+            )
+        )
+        assert len(executor._processes) == 3
+    finally:
+        executor._start_executor_manager_thread()
+        executor.shutdown()
+
+
+def test_worker_pools_fork_without_threads(monkeypatch, tmp_path) -> None:
+    batch_path = tmp_path / "scenarios"
+    batch_path.mkdir()
+    with open("tests/data/valid_schema/xml.valid_schema.positive.xosc") as file:
+        content = file.read()
+    # One pool per version
+    for rev_minor in ["1", "2", "3"]:
+        (batch_path / f"scenario_{rev_minor}.xosc").write_text(
+            content.replace('revMinor="3"', f'revMinor="{rev_minor}"')
+        )
+
+    fork = os.fork
+    thread_counts = []
+
+    def fork_and_count_threads():
+        thread_counts.append(threading.active_count())
+        return fork()
+
+    monkeypatch.setattr(os, "fork", fork_and_count_threads)
+
+    launch_batch(monkeypatch, str(batch_path), str(tmp_path / "results"), jobs=3)
+
+    assert len(thread_counts) == 3
+    assert thread_counts == [1, 1, 1]
@@ -0,0 +1,75 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import os
+import qc_openscenario.main as main
+from qc_baselib import Configuration, StatusType
+from qc_openscenario import constants
+from qc_openscenario.benchmark import generator, runner
+from qc_openscenario.checks import reference_checker
+
+SETTINGS = generator.CorpusSettings(
+    files=2,
+    entities=3,
+    stories=2,
+    acts_per_story=2,
+    maneuvers_per_act=2,
+    events_per_maneuver=2,
+    parameter_declaration_density=0.5,
+    parameters_per_declaration=2,
+    expression_density=0.3,
+    catalog_size=3,
+    signals=5,
+)
+
+
+def test_generate_corpus_is_deterministic(tmp_path) -> None:
+    first_files = generator.generate_corpus(str(tmp_path / "first"), SETTINGS)
+    second_files = generator.generate_corpus(str(tmp_path / "second"), SETTINGS)
+
+    assert len(first_files) == SETTINGS.files
+    for first_file, second_file in zip(first_files, second_files):
+        with open(first_file, "rb") as first, open(second_file, "rb") as second:
+            assert first.read() == second.read()
+
+
+def test_generate_corpus_is_valid(tmp_path) -> None:
+    input_files = generator.generate_corpus(str(tmp_path), SETTINGS)
+    catalog_file = os.path.join(
+        tmp_path, generator.CATALOG_DIR_NAME, generator.CATALOG_FILE_NAME
+    )
+
+    for input_file in input_files + [catalog_file]:
+        config = Configuration()
+        config.set_config_param(name="InputFile", value=input_file)
+        config.register_checker_bundle(checker_bundle_name=constants.BUNDLE_NAME)
+        result = main.create_result()
+
+        main.run_checks(config, result)
+
+        assert result.get_issue_count() == 0
+        if input_file != catalog_file:
+            # The signals are resolved in the generated road network
+            checker = (
+                reference_checker.resolvable_signal_id_in_traffic_signal_state_action
+            )
+            assert result.get_checker_status(checker.CHECKER_ID) == StatusType.COMPLETED
+
+
+def test_run_benchmark(monkeypatch, tmp_path) -> None:
+    monkeypatch.setitem(runner.CORPORA, "tiny", SETTINGS)
+
+    baseline = runner.run_benchmark(["tiny"], str(tmp_path))
+
+    measures = baseline["corpora"]["tiny"]
+    assert measures["files"] == SETTINGS.files
+    assert measures["bytes"] > 0
+    assert measures["mb_per_s"] > 0
+    assert measures["files_per_s"] > 0
+    assert set(measures["checkers"]) >= {
+        "check_asam_xosc_xml_valid_schema",
+        "check_asam_xosc_data_type_allowed_operators",
+    }
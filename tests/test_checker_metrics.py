@@ -0,0 +1,108 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import json
+import os
+import pytest
+import test_utils
+from qc_baselib import Configuration, Result, StatusType
+from qc_openscenario import api, constants
+from qc_openscenario.checks import checker_metrics, reference_checker, schema_checker
+
+
+@pytest.mark.parametrize("trace_memory", [False, True])
+def test_checker_metrics(monkeypatch, trace_memory: bool) -> None:
+    base_path = "tests/data/unique_element_names_on_same_level/"
+    target_file_path = os.path.join(
+        base_path, "unique_element_names_on_same_level.negative.multiple.xosc"
+    )
+    checker = reference_checker.unique_element_names_on_same_level
+    metrics_file_path = checker_metrics.get_metrics_file_path(
+        test_utils.REPORT_FILE_PATH
+    )
+
+    test_utils.create_test_config(
+        target_file_path,
+        bundle_params={
+            "checkerMetrics": "true",
+            "checkerMetricsMemory": str(trace_memory).lower(),
+        },
+    )
+    test_utils.launch_main(monkeypatch)
+
+    result = Result()
+    result.load_from_file(test_utils.REPORT_FILE_PATH)
+    with open(metrics_file_path) as file:
+        metrics = json.load(file)
+    os.remove(metrics_file_path)
+    test_utils.cleanup_files()
+
+    assert metrics["input_file"] == target_file_path
+    checker_result = metrics["checkers"][checker.CHECKER_ID]
+    assert checker_result["issue_count"] == len(
+        result.get_issues_by_rule_uid(checker.RULE_UID)
+    )
+    assert checker_result["issue_count"] > 0
+    assert checker_result["wall_time"] >= 0
+    assert checker_result["cpu_time"] >= 0
+    assert (checker_result["peak_memory"] is not None) == trace_memory
+
+    # The same metrics are parameters of the checker in the result
+    assert (
+        int(
+            result.get_param_from_checker(
+                checker_bundle_name=constants.BUNDLE_NAME,
+                checker_id=checker.CHECKER_ID,
+                param_name="issueCount",
+            )
+        )
+        == checker_result["issue_count"]
+    )
+    assert (
+        result.get_param_from_checker(
+            checker_bundle_name=constants.BUNDLE_NAME,
+            checker_id=checker.CHECKER_ID,
+            param_name="wallTime",
+        )
+        is not None
+    )
+
+
+@pytest.mark.parametrize("checker_threads", ["1", "4"])
+def test_checker_metrics_skipped_checkers(checker_threads: str) -> None:
+    config = Configuration()
+    config.register_checker_bundle(checker_bundle_name=constants.BUNDLE_NAME)
+    for name, value in [
+        ("checkerMetrics", "true"),
+        ("checkerThreads", checker_threads),
+    ]:
+        config.set_checker_bundle_param(
+            checker_bundle_name=constants.BUNDLE_NAME, name=name, value=value
+        )
+
+    with open("tests/data/valid_schema/xml.valid_schema.negative.xosc", "rb") as file:
+        result = api.validate(file.read(), config=config)
+
+    # Checkers skipped after the failed schema validation have no metrics,
+    # even if they ran speculatively
+    checker = reference_checker.resolvable_entity_references
+    assert result.get_checker_status(checker.CHECKER_ID) == StatusType.SKIPPED
+    assert (
+        result.get_param_from_checker(
+            checker_bundle_name=constants.BUNDLE_NAME,
+            checker_id=checker.CHECKER_ID,
+            param_name="wallTime",
+        )
+        is None
+    )
+    assert (
+        result.get_param_from_checker(
+            checker_bundle_name=constants.BUNDLE_NAME,
+            checker_id=schema_checker.valid_schema.CHECKER_ID,
+            param_name="issueCount",
+        )
+        == 1
+    )
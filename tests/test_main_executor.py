@@ -4,11 +4,26 @@
 # Public License, v. 2.0. If a copy of the MPL was not distributed
 # with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
 
+import logging
 import os
+import types
 import pytest
 import test_utils
-from qc_baselib import Result, IssueSeverity, StatusType
-from qc_openscenario.checks import basic_checker
+from concurrent.futures import ThreadPoolExecutor
+from lxml import etree
+from qc_baselib import Configuration, Result, IssueSeverity, StatusType
+import qc_openscenario.main as main
+from qc_openscenario import api, constants, tracing
+from qc_openscenario.checks import (
+    basic_checker,
+    data_type_checker,
+    reference_checker,
+    registry,
+    result_recorder,
+    schema_checker,
+    utils,
+    road_network_cache,
+)
 
 
 def test_non_existing_road_network_file(
@@ -25,3 +40,357 @@ def test_non_existing_road_network_file(
     # Should have no exception
     assert True
     test_utils.cleanup_files()
+
+
+def test_document_index() -> None:
+    target_file_path = "tests/data/parametric_entity_ref/CutIn.xosc"
+    tree = utils.get_root_without_default_namespace(target_file_path)
+
+    index = utils.build_document_index(tree)
+
+    assert index.storyboard is tree.find("Storyboard")
+    assert index.entities is tree.find("Entities")
+    assert index.get_elements_by_tag("Private") == tree.findall(".//Private")
+    assert index.get_elements_by_name("Ego") == tree.xpath(".//*[@name='Ego']")
+    for attribute_name in utils.SECTION_ATTRIBUTES["Storyboard"]:
+        assert index.get_section("Storyboard").get_elements_by_attribute(
+            attribute_name
+        ) == tree.find("Storyboard").xpath(f".//*[@{attribute_name}]")
+    assert index.get_section("RoadNetwork").get_elements_by_tag(
+        "TrafficSignalController"
+    ) == tree.find("RoadNetwork").findall(".//TrafficSignalController")
+    assert index.get_section("VariableDeclarations").get_elements_by_tag("Any") == []
+    # Other lookups are only indexed for the whole document
+    assert index.get_section("Storyboard").get_elements_by_tag("Private") == []
+
+
+@pytest.mark.parametrize(
+    "target_file_path",
+    [
+        "tests/data/parametric_entity_ref/CutIn.xosc",
+        "tests/data/positive_duration_in_phase/negative_example.parameter.xosc",
+        "tests/data/resolvable_storyboard_element_reference/resolvable_storyboard_element_reference.positive.parameter.xosc",
+        "tests/data/parameter_declaration_with_expression/VehicleCatalog.xosc",
+    ],
+)
+def test_parameter_scope_table(target_file_path: str) -> None:
+    tree = utils.get_root_without_default_namespace(target_file_path)
+    parameter_scopes = utils.build_parameter_scope_table(
+        utils.build_document_index(tree)
+    )
+    parameter_names = {
+        declaration.get("name") for declaration in tree.iter("ParameterDeclaration")
+    }
+    parameter_names.add("undeclared_parameter")
+
+    for element in tree.iter(etree.Element):
+        for parameter_name in parameter_names:
+            assert utils.get_parameter_value_from_node(
+                tree, element, parameter_name, parameter_scopes
+            ) == utils.get_parameter_value_from_node(tree, element, parameter_name)
+
+
+@pytest.mark.parametrize(
+    "xodr_file_path",
+    [
+        "tests/data/parametric_entity_ref/Databases/AB_RQ31_Straight.xodr",
+        "tests/data/parametric_input_xodr/Databases/fabriksgatan.xodr",
+    ],
+)
+def test_extract_road_network_facts(xodr_file_path: str) -> None:
+    xodr_tree = utils.get_root_without_default_namespace(xodr_file_path)
+
+    road_network_facts = utils.extract_road_network_facts(xodr_file_path)
+
+    assert road_network_facts.signal_ids == {
+        element.get("id") for element in xodr_tree.iter("signal")
+    }
+    # Controllers and junctions defined under the root only
+    for tag, ids in [
+        ("controller", road_network_facts.controller_ids),
+        ("junction", road_network_facts.junction_ids),
+    ]:
+        assert ids == {element.get("id") for element in xodr_tree.findall(tag)}
+
+
+def test_extract_road_network_facts_junction_controllers() -> None:
+    xodr_content = b"""<?xml version="1.0" encoding="UTF-8"?>
+<OpenDRIVE xmlns="http://code.asam.net/simulation/standard/opendrive_schema">
+    <header revMajor="1" revMinor="8"/>
+    <controller id="1" name="controller_1">
+        <control signalId="10"/>
+    </controller>
+    <junction id="100" name="junction_100">
+        <controller id="2" type="0"/>
+    </junction>
+</OpenDRIVE>
+"""
+
+    road_network_facts = utils.extract_road_network_facts_from_content(xodr_content)
+
+    # The controller of the junction is a reference, not a definition
+    assert road_network_facts.controller_ids == {"1"}
+    assert road_network_facts.junction_ids == {"100"}
+
+
+def test_road_network_facts_cache(tmp_path, monkeypatch) -> None:
+    xodr_file_path = "tests/data/parametric_entity_ref/Databases/AB_RQ31_Straight.xodr"
+    road_network_cache.clear()
+
+    road_network_facts = utils.get_cached_road_network_facts(
+        xodr_file_path, cache_dir=str(tmp_path)
+    )
+    assert len(list(tmp_path.iterdir())) == 1
+
+    def fail_extraction(path: str):
+        raise AssertionError(f"{path} should be read from the cache")
+
+    monkeypatch.setattr(utils, "extract_road_network_facts", fail_extraction)
+
+    # From memory, then from disk
+    assert utils.get_cached_road_network_facts(xodr_file_path) == road_network_facts
+    road_network_cache.clear()
+    assert (
+        utils.get_cached_road_network_facts(xodr_file_path, cache_dir=str(tmp_path))
+        == road_network_facts
+    )
+
+
+def test_road_network_facts_cache_eviction(tmp_path) -> None:
+    road_network_cache.clear()
+
+    for xodr_file_path in [
+        "tests/data/parametric_entity_ref/Databases/AB_RQ31_Straight.xodr",
+        "tests/data/parametric_input_xodr/Databases/fabriksgatan.xodr",
+    ]:
+        utils.get_cached_road_network_facts(
+            xodr_file_path, cache_dir=str(tmp_path), cache_max_size=1
+        )
+
+    # Entries bigger than the maximum size are not kept
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_concurrent_run_checks() -> None:
+    target_file_paths = [
+        "tests/data/parametric_input_xodr/CloseVehicleCrossing.xosc",
+        "tests/data/resolvable_signal_id_in_traffic_signal_state_action/reference_control.resolvable_signal_id_in_traffic_signal_state_action.positive.xosc",
+    ] * 4
+    working_directory = os.getcwd()
+
+    def run_checks(target_file_path: str) -> Result:
+        config = Configuration()
+        config.set_config_param(name="InputFile", value=target_file_path)
+        result = Result()
+        result.register_checker_bundle(
+            name=constants.BUNDLE_NAME,
+            description="OpenScenario checker bundle",
+            version=constants.BUNDLE_VERSION,
+            summary="",
+        )
+        main.run_checks(config, result)
+        return result
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(run_checks, target_file_paths))
+
+    assert os.getcwd() == working_directory
+    for result in results:
+        assert (
+            result.get_checker_status(
+                reference_checker.resolvable_signal_id_in_traffic_signal_state_action.CHECKER_ID
+            )
+            == StatusType.COMPLETED
+        )
+        assert result.get_issue_count() == 0
+
+
+def test_checker_registry() -> None:
+    checker_registry = registry.CHECKER_REGISTRY
+    checker_ids = [x.checker_id for x in checker_registry.checkers]
+
+    assert len(checker_ids) == 17
+    # Every checker comes after its preconditions
+    for i, checker in enumerate(checker_registry.checkers):
+        assert checker.preconditions <= set(checker_ids[:i])
+
+    assert checker_registry.select(
+        [basic_checker.fileheader_is_present.CHECKER_ID]
+    ) == {
+        basic_checker.valid_xml_document.CHECKER_ID,
+        basic_checker.root_tag_is_openscenario.CHECKER_ID,
+        basic_checker.fileheader_is_present.CHECKER_ID,
+    }
+
+
+@pytest.mark.parametrize(
+    "schema_version,enabled_count",
+    [(None, 4), ("1.0.0", 5), ("1.1.1", 5), ("1.2.0", 17), ("1.10.0", 17)],
+)
+def test_checker_registry_version_gate(schema_version: str, enabled_count: int):
+    enabled_checker_ids = registry.CHECKER_REGISTRY.get_enabled_checker_ids(
+        schema_version
+    )
+
+    assert len(enabled_checker_ids) == enabled_count
+    if schema_version is not None:
+        assert schema_checker.valid_schema.CHECKER_ID in enabled_checker_ids
+
+
+def test_checker_registry_invalid_graph() -> None:
+    with pytest.raises(ValueError):
+        # Preconditions of root_tag_is_openscenario are not registered
+        registry.CheckerRegistry(
+            basic_checkers=[basic_checker.root_tag_is_openscenario],
+            document_checkers=[],
+        )
+
+    with pytest.raises(ValueError):
+        # A basic checker cannot depend on schema validation
+        registry.CheckerRegistry(
+            basic_checkers=[
+                basic_checker.valid_xml_document,
+                basic_checker.root_tag_is_openscenario,
+                basic_checker.fileheader_is_present,
+                basic_checker.version_is_defined,
+                reference_checker.resolvable_entity_references,
+            ],
+            document_checkers=[schema_checker.valid_schema],
+        )
+
+
+def test_checker_registry_cycle() -> None:
+    def create_checker(checker_id: str, preconditions: set):
+        return types.SimpleNamespace(
+            CHECKER_ID=checker_id,
+            CHECKER_DESCRIPTION="",
+            CHECKER_PRECONDITIONS=preconditions,
+            RULE_UID=f"asam.net:xosc:1.2.0:{checker_id}",
+        )
+
+    with pytest.raises(ValueError):
+        registry.CheckerRegistry(
+            basic_checkers=[],
+            document_checkers=[
+                create_checker("a", {"b"}),
+                create_checker("b", {"a"}),
+            ],
+        )
+
+
+@pytest.mark.parametrize(
+    "target_file_path",
+    [
+        "tests/data/unique_element_names_on_same_level/unique_element_names_on_same_level.negative.multiple.xosc",
+        "tests/data/resolvable_entity_references/reference_control.resolvable_entity_references.negative.xosc",
+        "tests/data/valid_schema/xml.valid_schema.negative.xosc",
+        "tests/data/valid_schema/unsupported_schema.xosc",
+    ],
+)
+def test_concurrent_checkers(target_file_path: str) -> None:
+    with open(target_file_path, "rb") as file:
+        content = file.read()
+
+    results = []
+    for checker_threads in ["1", "4"]:
+        config = Configuration()
+        config.register_checker_bundle(checker_bundle_name=constants.BUNDLE_NAME)
+        config.set_checker_bundle_param(
+            checker_bundle_name=constants.BUNDLE_NAME,
+            name="checkerThreads",
+            value=checker_threads,
+        )
+        results.append(api.validate(content, config=config))
+
+    # Same checkers, statuses, issues, ids and order as a sequential run
+    sequential, concurrent = [
+        x.get_checker_bundle_result(constants.BUNDLE_NAME).model_dump() for x in results
+    ]
+    assert concurrent == sequential
+
+
+def test_concurrent_checkers_discarded_run(monkeypatch, caplog) -> None:
+    with open(
+        "tests/data/positive_duration_in_phase/negative_example.parameter.xosc", "rb"
+    ) as file:
+        # Schema-invalid, and the checker raises when run on it
+        content = file.read().replace(b' duration="$phase_duration"', b"")
+    checker_id = data_type_checker.positive_duration_in_phase.CHECKER_ID
+
+    config = Configuration()
+    config.register_checker_bundle(checker_bundle_name=constants.BUNDLE_NAME)
+    config.set_checker_bundle_param(
+        checker_bundle_name=constants.BUNDLE_NAME, name="checkerThreads", value="4"
+    )
+    monkeypatch.setattr(tracing, "_events", None)
+    tracing.start_tracing()
+
+    with caplog.at_level(logging.ERROR):
+        result = api.validate(content, config=config)
+
+    assert result.get_checker_status(checker_id) == StatusType.SKIPPED
+    assert result.get_issue_count() == 1
+    # The speculative run raised, but was discarded with its log and spans
+    assert f"An error occurred in {checker_id}" not in caplog.text
+    assert f"checker.{checker_id}" not in [x["name"] for x in tracing.collect_events()]
+
+
+def test_result_recorder(caplog) -> None:
+    result = main.create_result()
+
+    recorder = result_recorder.ResultRecorder()
+    checker = basic_checker.valid_xml_document
+    recorder.register_checker(
+        checker_bundle_name=constants.BUNDLE_NAME,
+        checker_id=checker.CHECKER_ID,
+        description=checker.CHECKER_DESCRIPTION,
+    )
+    recorder.register_rule_by_uid(
+        checker_bundle_name=constants.BUNDLE_NAME,
+        checker_id=checker.CHECKER_ID,
+        rule_uid=checker.RULE_UID,
+    )
+    for row in [1, 2]:
+        issue_id = recorder.register_issue(
+            checker_bundle_name=constants.BUNDLE_NAME,
+            checker_id=checker.CHECKER_ID,
+            description=f"Issue {row}",
+            level=IssueSeverity.ERROR,
+            rule_uid=checker.RULE_UID,
+        )
+        recorder.add_file_location(
+            checker_bundle_name=constants.BUNDLE_NAME,
+            checker_id=checker.CHECKER_ID,
+            issue_id=issue_id,
+            row=row,
+            column=0,
+            description=f"Location {row}",
+        )
+    recorder.set_checker_status(
+        checker_bundle_name=constants.BUNDLE_NAME,
+        checker_id=checker.CHECKER_ID,
+        status=StatusType.COMPLETED,
+    )
+    try:
+        raise ValueError("Recorded error")
+    except ValueError:
+        recorder.log_exception("An error occurred.")
+
+    assert recorder.get_checker_status(checker.CHECKER_ID) == StatusType.COMPLETED
+    assert (
+        recorder.get_checker_issue_count(constants.BUNDLE_NAME, checker.CHECKER_ID) == 2
+    )
+    # Nothing is written before the replay
+    assert result.get_checker_ids(checker_bundle_name=constants.BUNDLE_NAME) == []
+    assert caplog.text == ""
+
+    with caplog.at_level(logging.ERROR):
+        recorder.replay(result)
+
+    assert "An error occurred." in caplog.text
+    assert "ValueError: Recorded error" in caplog.text
+
+    assert result.get_checker_status(checker.CHECKER_ID) == StatusType.COMPLETED
+    issues = result.get_issues_by_rule_uid(checker.RULE_UID)
+    assert [x.description for x in issues] == ["Issue 1", "Issue 2"]
+    assert [x.locations[0].file_location[0].row for x in issues] == [1, 2]
@@ -0,0 +1,68 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import os
+import pstats
+import sys
+import pytest
+import test_utils
+import qc_openscenario.main as main
+from qc_openscenario import profiling
+from qc_openscenario.checks import reference_checker, schema_checker
+
+
+def test_profile(monkeypatch, tmp_path) -> None:
+    base_path = "tests/data/resolvable_signal_id_in_traffic_signal_state_action/"
+    target_file_path = os.path.join(
+        base_path,
+        "reference_control.resolvable_signal_id_in_traffic_signal_state_action.negative.xosc",
+    )
+    # Profiling is stopped again after the test
+    monkeypatch.setattr(profiling, "_profiles", None)
+
+    test_utils.create_test_config(target_file_path)
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        ["main.py", "-c", test_utils.CONFIG_FILE_PATH, "--profile", str(tmp_path)],
+    )
+    main.main()
+    test_utils.cleanup_files()
+
+    # One profile per phase
+    for phase in [
+        "ingest",
+        "document_index",
+        "road_network",
+        f"checker.{schema_checker.valid_schema.CHECKER_ID}",
+        f"checker.{reference_checker.resolvable_signal_id_in_traffic_signal_state_action.CHECKER_ID}",
+        "write_result",
+    ]:
+        profile_file = tmp_path / (phase + profiling.PROFILE_FILE_EXTENSION)
+        assert pstats.Stats(str(profile_file)).total_calls > 0
+
+    summary = (tmp_path / profiling.SUMMARY_FILE_NAME).read_text()
+    assert "function calls" in summary
+    assert "check_rule" in summary
+
+
+def test_profile_with_workers(monkeypatch, tmp_path) -> None:
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        [
+            "main.py",
+            "--batch",
+            "tests/data/valid_schema/",
+            "--jobs",
+            "2",
+            "--profile",
+            str(tmp_path),
+        ],
+    )
+
+    with pytest.raises(SystemExit):
+        main.args_entrypoint()
@@ -9,6 +9,7 @@ import pytest
 import test_utils
 from qc_baselib import Result, IssueSeverity, StatusType
 from qc_openscenario.checks import schema_checker
+from qc_openscenario.schema import schema_files, schema_registry
 
 
 def test_valid_schema_positive(
@@ -112,3 +113,52 @@ def test_invalid_schema(
     assert len(xml_schema_issues) == 1
     assert xml_schema_issues[0].level == IssueSeverity.ERROR
     test_utils.cleanup_files()
+
+
+@pytest.mark.parametrize(
+    "target_file_name,issue_count",
+    [
+        ("xml.valid_schema.positive.xosc", 0),
+        ("xml.valid_schema.negative.xosc", 1),
+    ],
+)
+def test_valid_schema_validate_while_parsing(
+    target_file_name: str,
+    issue_count: int,
+    monkeypatch,
+) -> None:
+    base_path = "tests/data/valid_schema/"
+    target_file_path = os.path.join(base_path, target_file_name)
+
+    test_utils.create_test_config(
+        target_file_path, bundle_params={"validateWhileParsing": "true"}
+    )
+
+    test_utils.launch_main(monkeypatch)
+
+    result = Result()
+    result.load_from_file(test_utils.REPORT_FILE_PATH)
+
+    assert (
+        result.get_checker_status(schema_checker.valid_schema.CHECKER_ID)
+        == StatusType.COMPLETED
+    )
+
+    xml_schema_issues = result.get_issues_by_rule_uid(
+        "asam.net:xosc:1.0.0:xml.valid_schema"
+    )
+    assert len(xml_schema_issues) == issue_count
+    for issue in xml_schema_issues:
+        assert issue.locations[0].file_location[0].row > 0
+    test_utils.cleanup_files()
+
+
+def test_schema_registry_compiles_once() -> None:
+    schema_registry.preload_schemas()
+
+    for schema_version in schema_files.SCHEMA_FILES:
+        schema = schema_registry.get_schema(schema_version)
+        assert schema is not None
+        assert schema_registry.get_schema(schema_version) is schema
+
+    assert schema_registry.get_schema("0.9.0") is None
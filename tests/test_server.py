@@ -0,0 +1,173 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import http.client
+import json
+import os
+import signal
+import socket
+import threading
+import pytest
+import qc_openscenario.main as main
+from qc_baselib import Result
+from qc_openscenario import server, worker_pool
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, socket_path: str):
+        super().__init__("localhost")
+        self.socket_path = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(self.socket_path)
+
+
+@pytest.fixture(scope="module")
+def service():
+    service = server.ValidationService(main.check_file, workers=1, queue_size=1)
+    yield service
+    service.shutdown()
+
+
+@pytest.fixture
+def http_server(service):
+    http_server = server.create_server(service, port=0)
+    thread = threading.Thread(target=http_server.serve_forever, daemon=True)
+    thread.start()
+    yield http_server
+    http_server.shutdown()
+    http_server.server_close()
+
+
+def request(
+    http_server, method: str, url: str, body: bytes = None
+) -> http.client.HTTPResponse:
+    connection = http.client.HTTPConnection(*http_server.server_address)
+    connection.request(method, url, body=body)
+    return connection.getresponse()
+
+
+def test_server_check_path(http_server, tmp_path) -> None:
+    input_file = os.path.abspath(
+        "tests/data/valid_schema/xml.valid_schema.negative.xosc"
+    )
+
+    response = request(http_server, "POST", f"/check?path={input_file}")
+
+    assert response.status == 200
+    assert response.getheader("Content-Type") == "application/xml"
+
+    result_file = tmp_path / "result.xqar"
+    result_file.write_bytes(response.read())
+    result = Result()
+    result.load_from_file(str(result_file))
+
+    issues = result.get_issues_by_rule_uid("asam.net:xosc:1.0.0:xml.valid_schema")
+    assert len(issues) == 1
+    assert response.getheader("X-Issue-Count") == str(result.get_issue_count())
+
+
+def test_server_check_bytes(http_server) -> None:
+    with open("tests/data/root_tag_is_openscenario/negative.xosc", "rb") as file:
+        content = file.read()
+
+    response = request(http_server, "POST", "/check?format=json", body=content)
+
+    assert response.status == 200
+    assert response.getheader("Content-Type") == "application/json"
+    result = json.loads(response.read())
+    issues = [
+        issue
+        for bundle in result["checker_bundles"]
+        for checker in bundle["checkers"]
+        for issue in checker["issues"]
+    ]
+    assert [x["rule_uid"] for x in issues] == [
+        "asam.net:xosc:1.0.0:xml.root_tag_is_openscenario"
+    ]
+
+
+def test_server_bad_requests(http_server) -> None:
+    assert request(http_server, "POST", "/check").status == 400
+    assert request(http_server, "POST", "/check?format=csv", body=b"<a/>").status == 400
+    assert request(http_server, "GET", "/unknown").status == 404
+
+
+def test_server_backpressure(http_server, service) -> None:
+    # Occupy all the slots, as if the worker and the queue were busy
+    for _ in range(service.capacity):
+        assert service.try_acquire()
+
+    try:
+        response = request(http_server, "GET", "/health")
+        assert json.loads(response.read())["pending"] == service.capacity
+
+        response = request(http_server, "POST", "/check", body=b"<a/>")
+        assert response.status == 503
+        assert response.getheader("Retry-After") == "1"
+    finally:
+        for _ in range(service.capacity):
+            service.release()
+
+    response = request(http_server, "POST", "/check", body=b"<a/>")
+    assert response.status == 200
+
+
+def test_server_unix_socket(service, tmp_path) -> None:
+    socket_path = str(tmp_path / "server.sock")
+    http_server = server.create_server(service, unix_socket=socket_path)
+    thread = threading.Thread(target=http_server.serve_forever, daemon=True)
+    thread.start()
+
+    try:
+        connection = UnixHTTPConnection(socket_path)
+        connection.request("GET", "/health")
+        response = connection.getresponse()
+
+        assert response.status == 200
+        status = json.loads(response.read())
+        assert status["workers"] == 1
+        assert "1.3.0" in status["schemas"]
+    finally:
+        http_server.shutdown()
+        http_server.server_close()
+
+
+def test_server_worker_died(monkeypatch) -> None:
+    service = server.ValidationService(main.check_file, workers=1, queue_size=1)
+    http_server = server.create_server(service, port=0)
+    thread = threading.Thread(target=http_server.serve_forever, daemon=True)
+    thread.start()
+
+    health = []
+    create_worker_pool = worker_pool.create_worker_pool
+
+    def record_health(*args):
+        response = request(http_server, "GET", "/health")
+        health.append(json.loads(response.read())["status"])
+        return create_worker_pool(*args)
+
+    monkeypatch.setattr(worker_pool, "create_worker_pool", record_health)
+
+    try:
+        # Kill the worker, as if it ran out of memory
+        for pid in list(service._executor._processes):
+            os.kill(pid, signal.SIGKILL)
+
+        response = request(http_server, "POST", "/check", body=b"<a/>")
+        assert response.status == 500
+        assert health == ["degraded"]
+
+        # The next files are checked by the new pool
+        response = request(http_server, "POST", "/check", body=b"<a/>")
+        assert response.status == 200
+        response = request(http_server, "GET", "/health")
+        assert json.loads(response.read())["status"] == "ok"
+    finally:
+        http_server.shutdown()
+        http_server.server_close()
+        service.shutdown()
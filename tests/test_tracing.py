@@ -0,0 +1,88 @@
+# SPDX-License-Identifier: MPL-2.0
+# Copyright 2024, ASAM e.V.
+# This Source Code Form is subject to the terms of the Mozilla
+# Public License, v. 2.0. If a copy of the MPL was not distributed
+# with this file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import json
+import os
+import sys
+import pytest
+import test_utils
+import qc_openscenario.main as main
+from qc_openscenario import batch, tracing
+from qc_openscenario.checks import schema_checker
+
+
+def read_trace_spans(trace_file) -> list:
+    with open(trace_file) as file:
+        trace = json.load(file)
+
+    return [x for x in trace["traceEvents"] if x["ph"] == "X"]
+
+
+def test_trace(monkeypatch, tmp_path) -> None:
+    target_file_path = "tests/data/valid_schema/xml.valid_schema.positive.xosc"
+    trace_file = tmp_path / "trace.json"
+    # Tracing is stopped again after the test
+    monkeypatch.setattr(tracing, "_events", None)
+
+    test_utils.create_test_config(target_file_path)
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        ["main.py", "-c", test_utils.CONFIG_FILE_PATH, "--trace", str(trace_file)],
+    )
+    main.main()
+    test_utils.cleanup_files()
+
+    spans = read_trace_spans(trace_file)
+    names = [x["name"] for x in spans]
+    for name in [
+        "ingest",
+        "document_index",
+        f"checker.{schema_checker.valid_schema.CHECKER_ID}",
+        "write_result",
+    ]:
+        assert name in names
+    assert all(x["pid"] == os.getpid() and x["dur"] >= 0 for x in spans)
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_trace_batch(monkeypatch, tmp_path, jobs: int) -> None:
+    batch_path = "tests/data/valid_schema/"
+    trace_file = tmp_path / "trace.json"
+    monkeypatch.setattr(tracing, "_events", None)
+
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        [
+            "main.py",
+            "--batch",
+            batch_path,
+            "--output_dir",
+            str(tmp_path / "results"),
+            "--jobs",
+            str(jobs),
+            "--trace",
+            str(trace_file),
+        ],
+    )
+    main.main()
+
+    spans = read_trace_spans(trace_file)
+    file_spans = [x for x in spans if x["name"] == "check_file"]
+    assert sorted(x["args"]["input_file"] for x in file_spans) == sorted(
+        batch.get_input_files(batch_path)
+    )
+
+    # Files are checked in worker processes, each with its own track
+    file_pids = {x["pid"] for x in file_spans}
+    if jobs == 1:
+        assert file_pids == {os.getpid()}
+    else:
+        assert os.getpid() not in file_pids
+    # Checker spans of the workers are sent back with the results
+    checker_spans = [x for x in spans if x["cat"] == "checker"]
+    assert {x["pid"] for x in checker_spans} == file_pids
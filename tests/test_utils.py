@@ -7,7 +7,7 @@
 import os
 import sys
 import pytest
-from typing import List
+from typing import List, Optional
 import qc_openscenario.main as main
 from qc_openscenario import constants, checks
 from qc_baselib import Configuration, Result
@@ -17,7 +17,7 @@ CONFIG_FILE_PATH = "bundle_config.xml"
 REPORT_FILE_PATH = "xosc_bundle_report.xqar"
 
 
-def create_test_config(target_file_path: str):
+def create_test_config(target_file_path: str, bundle_params: Optional[dict] = None):
     test_config = Configuration()
     test_config.set_config_param(name="InputFile", value=target_file_path)
     test_config.register_checker_bundle(checker_bundle_name=constants.BUNDLE_NAME)
@@ -26,6 +26,12 @@ def create_test_config(target_file_path: str):
         name="resultFile",
         value=REPORT_FILE_PATH,
     )
+    for name, value in (bundle_params or {}).items():
+        test_config.set_checker_bundle_param(
+            checker_bundle_name=constants.BUNDLE_NAME,
+            name=name,
+            value=value,
+        )
 
     test_config.write_to_file(CONFIG_FILE_PATH)
 